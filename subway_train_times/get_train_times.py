@@ -3,7 +3,7 @@
 MTA Subway Train Times - Config-Driven Edition
 
 This script fetches real-time train arrival information from the MTA GTFS feed
-for configured subway stops. Configure your stops in config.yaml.
+for configured subway stops. Configure your stops in config.yaml (or config.toml).
 
 Usage:
     python get_train_times.py
@@ -12,12 +12,32 @@ Requirements:
     pip install -r requirements.txt
 """
 
+import hashlib
+import heapq
+import os
 import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
+import requests
 import yaml
-from nyct_gtfs import NYCTFeed
+from nyct_gtfs.compiled_gtfs import gtfs_realtime_pb2, nyct_subway_pb2
+
+# Prefer the libyaml-backed loader, which is several times faster
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# tomllib (Python 3.11+) parses config.toml much faster than PyYAML
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
 
 # Mapping of train routes to their GTFS feed URLs
 ROUTE_TO_FEED = {
@@ -47,12 +67,59 @@ ROUTE_TO_FEED = {
     'SIR': 'https://api-endpoint.mta.info/Dataservice/mtagtfsfeeds/nyct%2Fgtfs-si',
 }
 
+# (routes, feed URL) for each distinct feed, so the feeds a station needs are
+# found with one set intersection per feed
+FEEDS = tuple(
+    (frozenset(route for route, url in ROUTE_TO_FEED.items() if url == feed_url), feed_url)
+    for feed_url in dict.fromkeys(ROUTE_TO_FEED.values())
+)
+
+# Vehicle positions up to this far ahead of the feed timestamp still count as
+# underway (allows for clock skew between MTA servers)
+UNDERWAY_CLOCK_SKEW = 60  # seconds
+
+# Maximum number of feeds downloaded concurrently (be polite to the MTA API)
+MAX_FEED_WORKERS = 4
+
+# On-disk cache of raw GTFS-realtime feeds, shared between invocations.
+# MTA regenerates feeds roughly every 30 seconds, so a short TTL is safe.
+FEED_CACHE_DIR = Path.home() / ".cache" / "pi-zero"
+FEED_CACHE_TTL = 15  # seconds
+
+# Last parsed config as (path, mtime, config), reused until the file changes
+_CONFIG_CACHE = None
+
+
+def find_config(script_dir):
+    """Return config.toml in script_dir if present (and supported), else config.yaml."""
+    toml_path = script_dir / "config.toml"
+    if tomllib is not None and toml_path.exists():
+        return toml_path
+    return script_dir / "config.yaml"
+
 
 def load_config(config_path="config.yaml"):
-    """Load configuration from YAML file."""
+    """
+    Load configuration from a TOML or YAML file (cached until the file is modified).
+
+    Files ending in .toml are parsed with tomllib; anything else is read as YAML.
+    """
+    global _CONFIG_CACHE
+
     try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        mtime = os.stat(config_path).st_mtime
+        if _CONFIG_CACHE is not None and _CONFIG_CACHE[:2] == (config_path, mtime):
+            return _CONFIG_CACHE[2]
+
+        if str(config_path).endswith(".toml"):
+            if tomllib is None:
+                print(f"Error: TOML config '{config_path}' requires Python 3.11+")
+                sys.exit(1)
+            with open(config_path, 'rb') as f:
+                config = tomllib.load(f)
+        else:
+            with open(config_path, 'r') as f:
+                config = yaml.load(f, Loader=_YamlLoader)
 
         if not config:
             print(f"Error: Config file '{config_path}' is empty")
@@ -64,6 +131,7 @@ def load_config(config_path="config.yaml"):
             print(f"Error: No stations configured in '{config_path}'")
             sys.exit(1)
 
+        _CONFIG_CACHE = (config_path, mtime, config)
         return config
 
     except FileNotFoundError:
@@ -75,138 +143,274 @@ def load_config(config_path="config.yaml"):
         print(f"Error parsing YAML config: {e}")
         sys.exit(1)
 
+    except ValueError as e:
+        # tomllib.TOMLDecodeError is a ValueError subclass
+        print(f"Error parsing TOML config: {e}")
+        sys.exit(1)
+
+
+def _write_cache_file(cache_file, data):
+    """Atomically write data to cache_file (best effort, errors are ignored)."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, cache_file)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def cached_feed(feed_url, ttl=FEED_CACHE_TTL):
+    """
+    Load a GTFS-realtime feed, reusing a recent on-disk copy when available.
+
+    Args:
+        feed_url: MTA feed URL
+        ttl: Maximum age in seconds of a cached copy before it is refetched
+
+    Returns:
+        gtfs_realtime_pb2.FeedMessage: Parsed feed
+    """
+    cache_file = FEED_CACHE_DIR / f"{hashlib.sha1(feed_url.encode()).hexdigest()}.pb"
+
+    data = None
+    try:
+        if time.time() - cache_file.stat().st_mtime < ttl:
+            data = cache_file.read_bytes()
+    except OSError:
+        pass  # No usable cached copy
+
+    if data is None:
+        response = requests.get(feed_url, timeout=10)
+        response.raise_for_status()
+        data = response.content
+        _write_cache_file(cache_file, data)
+
+    feed = gtfs_realtime_pb2.FeedMessage()
+    feed.ParseFromString(data)
+    return feed
+
+
+def fetch_feeds(feed_urls):
+    """
+    Download each GTFS-realtime feed exactly once, concurrently.
+
+    Args:
+        feed_urls: Iterable of MTA feed URLs
+
+    Returns:
+        tuple: (feeds, errors) - dicts mapping feed URL to its FeedMessage, and
+            feeds that failed to the exception raised while fetching them
+    """
+    feed_urls = list(feed_urls)
+    feeds = {}
+    errors = {}
+    if not feed_urls:
+        return feeds, errors
+
+    # Each fetch is a blocking HTTPS request, so download them in parallel
+    num_workers = min(MAX_FEED_WORKERS, len(feed_urls))
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futures = {executor.submit(cached_feed, url): url for url in feed_urls}
+        for future in as_completed(futures):
+            feed_url = futures[future]
+            try:
+                feeds[feed_url] = future.result()
+            except Exception as e:
+                errors[feed_url] = e
+
+    return feeds, errors
 
-def get_train_times_for_station(station_config, num_trains=10):
+
+def _trip_key(trip):
+    """Identify a trip the way nyct_gtfs does (trip_id alone is not unique)."""
+    train_id = trip.Extensions[nyct_subway_pb2.nyct_trip_descriptor].train_id
+    return f"{trip.trip_id} {train_id[-7:]}"
+
+
+def index_feed(feed, wanted_stops=None, wanted_routes=None):
+    """
+    Index a feed's upcoming arrivals by stop ID.
+
+    Reads the raw protobuf directly, touching only the trip, route, stop and
+    arrival fields. This skips nyct_gtfs's Trip/StopTimeUpdate wrappers and the
+    static GTFS tables NYCTFeed loads on construction. Each feed is walked
+    once, so looking stops up in this index is far cheaper than filtering trips
+    per stop and direction.
+
+    Only underway trips are included: those whose vehicle has reported a
+    position that isn't future-dated (the same rule as nyct_gtfs). Like
+    nyct_gtfs, a trip listed more than once keeps only its last update, and
+    each trip contributes at most one arrival per stop.
+
+    Args:
+        feed: gtfs_realtime_pb2.FeedMessage
+        wanted_stops: Optional set of directional stop IDs to keep; arrivals at
+            any other stop are skipped (None keeps every stop)
+        wanted_routes: Optional set of route IDs to keep (None keeps every route)
+
+    Returns:
+        dict: Directional stop ID (e.g. "127N") to list of (route_id, arrival_ts)
+    """
+    underway_cutoff = feed.header.timestamp + UNDERWAY_CLOCK_SKEW
+    underway = {
+        _trip_key(entity.vehicle.trip)
+        for entity in feed.entity
+        if entity.HasField('vehicle') and entity.vehicle.timestamp <= underway_cutoff
+    }
+
+    trip_updates = {}
+    for entity in feed.entity:
+        if not entity.HasField('trip_update'):
+            continue
+
+        trip_update = entity.trip_update
+        if wanted_routes is not None and trip_update.trip.route_id not in wanted_routes:
+            continue
+        trip_key = _trip_key(trip_update.trip)
+        if trip_key in underway:
+            trip_updates[trip_key] = trip_update
+
+    trips_by_stop = defaultdict(list)
+    for trip_update in trip_updates.values():
+        route = trip_update.trip.route_id
+        seen_stops = set()
+        for update in trip_update.stop_time_update:
+            stop_id = update.stop_id
+            if stop_id in seen_stops:
+                continue
+            seen_stops.add(stop_id)
+            if wanted_stops is not None and stop_id not in wanted_stops:
+                continue
+            if update.HasField('arrival'):
+                trips_by_stop[stop_id].append((route, update.arrival.time))
+    return trips_by_stop
+
+
+def station_stop_ids(station_config):
+    """Return a station's base stop IDs (supports 'stop_id' or 'stop_ids')."""
+    stop_ids = station_config.get('stop_ids', [station_config.get('stop_id')])
+    if not isinstance(stop_ids, list):
+        stop_ids = [stop_ids]
+    return stop_ids
+
+
+def compile_station(station_config, num_trains=10):
     """
-    Fetch and display train times for a configured station.
+    Prepare a configured station for display.
+
+    Everything that depends only on the config (route set, directional stop
+    IDs, feed URLs, labels) is worked out once here and bound as closure
+    variables, so the returned function only does per-run work.
 
     Args:
         station_config: Dictionary containing station configuration
         num_trains: Number of upcoming trains to display per direction
+
+    Returns:
+        callable: Takes a mapping of feed URL to index_feed() result (and
+            optionally fetch_feeds() errors) and displays the station's
+            upcoming trains
     """
     station_name = station_config['name']
-    routes = station_config['routes']
+    routes = frozenset(station_config['routes'])
 
     # Support both single stop_id and multiple stop_ids
-    stop_ids = station_config.get('stop_ids', [station_config.get('stop_id')])
-    if not isinstance(stop_ids, list):
-        stop_ids = [stop_ids]
+    stop_ids = station_stop_ids(station_config)
+
+    uptown_stop_ids = tuple(f"{stop_id}N" for stop_id in stop_ids)
+    downtown_stop_ids = tuple(f"{stop_id}S" for stop_id in stop_ids)
 
     # Get direction labels
     directions = station_config.get('directions', {
         'uptown': 'UPTOWN',
         'downtown': 'DOWNTOWN'
     })
+    uptown_label = directions['uptown']
+    downtown_label = directions['downtown']
 
-    # Group routes by their feed to minimize API calls
-    feed_to_routes = {}
-    for route in routes:
+    for route in station_config['routes']:
         if route not in ROUTE_TO_FEED:
             print(f"Warning: Unknown route '{route}', skipping")
-            continue
 
-        feed_url = ROUTE_TO_FEED[route]
-        if feed_url not in feed_to_routes:
-            feed_to_routes[feed_url] = []
-        feed_to_routes[feed_url].append(route)
+    # Feeds carrying any of this station's routes
+    feed_urls = tuple(feed_url for feed_routes, feed_url in FEEDS if feed_routes & routes)
 
-    # Collect all trains for both directions
-    uptown_arrivals = []  # List of (arrival_time, route, minutes_away)
-    downtown_arrivals = []
+    def show_station(feed_arrivals, feed_errors=None):
+        # Collect all trains for both directions
+        uptown_arrivals = []  # List of (arrival_ts, route, minutes_away)
+        downtown_arrivals = []
 
-    try:
-        # Fetch trains from each feed
-        for feed_url, feed_routes in feed_to_routes.items():
-            feed = NYCTFeed(feed_url)
-
-            # Check each stop ID
-            for stop_id_base in stop_ids:
-                uptown_stop_id = f"{stop_id_base}N"
-                downtown_stop_id = f"{stop_id_base}S"
-
-                # Get uptown trains
-                uptown_trips = feed.filter_trips(
-                    headed_for_stop_id=uptown_stop_id,
-                    underway=True
-                )
-
-                for trip in uptown_trips:
-                    route = trip.route_id
-
-                    # Filter by configured routes
-                    if route not in routes:
-                        continue
-
-                    for update in trip.stop_time_updates:
-                        if update.stop_id == uptown_stop_id:
-                            arrival_time = update.arrival
-                            now = datetime.now()
-                            minutes_away = int((arrival_time - now).total_seconds() / 60)
+        # One reference time for every arrival at this station
+        now_ts = time.time()
+
+        try:
+            # A feed this station needs couldn't be downloaded
+            for feed_url in feed_urls:
+                if feed_errors and feed_url in feed_errors:
+                    raise feed_errors[feed_url]
+
+            # Collect trains from each feed
+            for feed_url in feed_urls:
+                trips_by_stop = feed_arrivals.get(feed_url)
+                if trips_by_stop is None:
+                    continue
+
+                for stop_ids, arrivals in ((uptown_stop_ids, uptown_arrivals),
+                                           (downtown_stop_ids, downtown_arrivals)):
+                    for stop_id in stop_ids:
+                        for route, arrival_ts in trips_by_stop.get(stop_id, ()):
+                            if route not in routes:
+                                continue
+
+                            minutes_away = int((arrival_ts - now_ts) / 60)
 
                             if minutes_away >= 0:
-                                uptown_arrivals.append((arrival_time, route, minutes_away))
-                            break
+                                arrivals.append((arrival_ts, route, minutes_away))
 
-                # Get downtown trains
-                downtown_trips = feed.filter_trips(
-                    headed_for_stop_id=downtown_stop_id,
-                    underway=True
-                )
+            # Keep only the next num_trains arrivals, in arrival order
+            uptown_arrivals = heapq.nsmallest(num_trains, uptown_arrivals, key=lambda x: x[0])
+            downtown_arrivals = heapq.nsmallest(num_trains, downtown_arrivals, key=lambda x: x[0])
 
-                for trip in downtown_trips:
-                    route = trip.route_id
+            # Build the whole block and write it once
+            out = [
+                f"\n{'=' * 70}\n",
+                f"Station: {station_name}\n",
+                f"{'=' * 70}\n",
+            ]
 
-                    # Filter by configured routes
-                    if route not in routes:
-                        continue
+            for label, arrivals in ((uptown_label, uptown_arrivals),
+                                    (downtown_label, downtown_arrivals)):
+                out.append(f"\n{label}:\n")
+                out.append(f"{'-' * 70}\n")
+                if arrivals:
+                    for _, route, minutes_away in arrivals:
+                        time_str = f"{minutes_away} min" if minutes_away > 0 else "Arriving"
+                        out.append(f"  {route} Train: {time_str}\n")
+                else:
+                    out.append("  No trains currently scheduled\n")
 
-                    for update in trip.stop_time_updates:
-                        if update.stop_id == downtown_stop_id:
-                            arrival_time = update.arrival
-                            now = datetime.now()
-                            minutes_away = int((arrival_time - now).total_seconds() / 60)
+        except Exception as e:
+            out = [
+                f"\nError fetching data for {station_name}: {e}\n",
+                "Please verify the stop ID and routes are correct\n",
+            ]
 
-                            if minutes_away >= 0:
-                                downtown_arrivals.append((arrival_time, route, minutes_away))
-                            break
-
-        # Sort by arrival time
-        uptown_arrivals.sort(key=lambda x: x[0])
-        downtown_arrivals.sort(key=lambda x: x[0])
-
-        # Display results
-        print(f"\n{'=' * 70}")
-        print(f"Station: {station_name}")
-        print(f"{'=' * 70}")
-
-        print(f"\n{directions['uptown']}:")
-        print("-" * 70)
-        if uptown_arrivals:
-            for _, route, minutes_away in uptown_arrivals[:num_trains]:
-                time_str = f"{minutes_away} min" if minutes_away > 0 else "Arriving"
-                print(f"  {route} Train: {time_str}")
-        else:
-            print("  No trains currently scheduled")
-
-        print(f"\n{directions['downtown']}:")
-        print("-" * 70)
-        if downtown_arrivals:
-            for _, route, minutes_away in downtown_arrivals[:num_trains]:
-                time_str = f"{minutes_away} min" if minutes_away > 0 else "Arriving"
-                print(f"  {route} Train: {time_str}")
-        else:
-            print("  No trains currently scheduled")
+        sys.stdout.write("".join(out))
 
-    except Exception as e:
-        print(f"\nError fetching data for {station_name}: {e}")
-        print("Please verify the stop ID and routes are correct")
+    return show_station
 
 
 def main():
     """Main execution function."""
     # Determine config path
     script_dir = Path(__file__).parent
-    config_path = script_dir / "config.yaml"
+    config_path = find_config(script_dir)
 
     # Load configuration
     config = load_config(config_path)
@@ -214,14 +418,33 @@ def main():
     # Get number of trains to display
     num_trains = config.get('num_trains', 10)
 
-    print(f"\nFetching MTA train times...")
-    print(f"Time: {datetime.now().strftime('%I:%M %p')}")
+    sys.stdout.write(f"\nFetching MTA train times...\nTime: {datetime.now().strftime('%I:%M %p')}\n")
+
+    stations = config.get('stations', config.get('stops', []))
+    station_displays = [compile_station(station, num_trains) for station in stations]
+
+    # Fetch every feed needed by any station once, so stations sharing a
+    # feed don't download and parse it again
+    all_routes = frozenset(route for station in stations for route in station.get('routes', []))
+    feeds, feed_errors = fetch_feeds(feed_url for feed_routes, feed_url in FEEDS if feed_routes & all_routes)
+
+    # Index only the stops and routes some station displays, so arrivals at
+    # the rest of the network are dropped while walking each feed
+    wanted_stops = frozenset(
+        f"{stop_id}{direction}"
+        for station in stations
+        for stop_id in station_stop_ids(station)
+        for direction in "NS"
+    )
+    feed_arrivals = {
+        url: index_feed(feed, wanted_stops, all_routes) for url, feed in feeds.items()
+    }
 
     # Process each configured station
-    for station in config.get('stations', config.get('stops', [])):
-        get_train_times_for_station(station, num_trains)
+    for show_station in station_displays:
+        show_station(feed_arrivals, feed_errors)
 
-    print(f"\n{'=' * 70}\n")
+    sys.stdout.write(f"\n{'=' * 70}\n\n")
 
 
 if __name__ == "__main__":
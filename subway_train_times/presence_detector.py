@@ -4,11 +4,25 @@ Presence Detector - Detects device presence on local network
 Supports multiple detection methods with 30-second caching
 """
 
+import fcntl
+import ipaddress
+import json
+import os
+import re
 import subprocess
+import tempfile
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Non-interactive sudo: fail immediately instead of waiting for a password
+ARP_SCAN_COMMAND = ["sudo", "-n", "arp-scan", "--localnet", "--quiet"]
+ARP_SCAN_TIMEOUT = 5  # seconds
+# Largest network swept in-process (/22 = 1022 hosts); bigger ones use arp-scan
+ARP_PROBE_MIN_PREFIX = 22
+
+_scapy_missing = False  # Set once importing scapy has failed
+
 
 class PresenceDetector:
     """
@@ -17,23 +31,43 @@ class PresenceDetector:
     Supports:
     - arp-scan method (fast, requires sudo)
     - dhcp-leases method (slower, no sudo required)
-    - 30-second result caching
+    - 30-second result caching, shared between processes
     - Graceful error handling
     """
 
-    def __init__(self, mac_addresses=None, cache_duration=30):
+    def __init__(self, mac_addresses=None, cache_duration=30, shared_cache_file=None):
         """
         Initialize presence detector.
 
         Args:
             mac_addresses: List of MAC addresses to detect (e.g., ["aa:bb:cc:dd:ee:ff"])
             cache_duration: Cache duration in seconds (default 30)
+            shared_cache_file: Path of the cache file shared with other processes
+                (default: presence.json in the user's runtime directory)
         """
         self.mac_addresses = [mac.lower() for mac in (mac_addresses or [])]
         self.cache_duration = cache_duration
+
+        # Single pattern matching any configured MAC, so command output is
+        # scanned once instead of once per device
+        self._mac_pattern = None
+        if self.mac_addresses:
+            self._mac_pattern = re.compile("|".join(re.escape(mac) for mac in self.mac_addresses))
+
+        self.shared_cache_file = Path(shared_cache_file or self._default_shared_cache_file())
+        self._executor = None  # Created on first detection
+        self._lease_file = None  # Resolved on first dhcp-leases check
         self._cached_result = None
         self._cache_timestamp = None
 
+    @staticmethod
+    def _default_shared_cache_file():
+        """Locate presence.json in the per-user runtime dir (tmpfs), or /tmp."""
+        runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or f"/run/user/{os.getuid()}"
+        if os.path.isdir(runtime_dir):
+            return Path(runtime_dir) / "presence.json"
+        return Path(tempfile.gettempdir()) / f"presence-{os.getuid()}.json"
+
     def is_anyone_home(self):
         """
         Check if any configured device is present on the network.
@@ -50,75 +84,203 @@ class PresenceDetector:
         if not self.mac_addresses:
             return False
 
-        # Try detection methods in order of preference
-        result = self._detect_presence()
+        # Reuse a result from another process, or detect and share it
+        result, timestamp = self._shared_detect()
 
-        # Cache the result
+        # Cache the result, back-dated by the shared entry's age. The local
+        # timestamp is monotonic so wall-clock jumps (NTP, DST) can't extend
+        # or cut short the cache.
         self._cached_result = result
-        self._cache_timestamp = datetime.now()
+        self._cache_timestamp = time.monotonic() - max(0.0, time.time() - timestamp)
 
         return result
 
+    def _shared_detect(self):
+        """
+        Return a fresh result from the shared cache file, detecting if needed.
+
+        Holds an exclusive lock while detecting so that sibling processes wait
+        for this scan instead of starting their own.
+
+        Returns:
+            tuple: (result, timestamp) where timestamp is seconds since the epoch
+        """
+        try:
+            lock_file = open(f"{self.shared_cache_file}.lock", "a")
+        except OSError:
+            return self._detect_presence(), time.time()
+
+        with lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            entry = self._read_shared_cache()
+            if entry is not None:
+                return entry
+
+            result = self._detect_presence()
+            timestamp = time.time()
+            self._write_shared_cache(result, timestamp)
+            return result, timestamp
+
+    def _read_shared_cache(self):
+        """Read a still-valid (result, timestamp) for our devices, or None."""
+        try:
+            with open(self.shared_cache_file, "r") as f:
+                entry = json.load(f)
+
+            if entry["devices"] != sorted(self.mac_addresses):
+                return None
+
+            age = time.time() - entry["timestamp"]
+            if 0 <= age < self.cache_duration:
+                return bool(entry["result"]), entry["timestamp"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        return None
+
+    def _write_shared_cache(self, result, timestamp):
+        """Atomically replace the shared cache file (best effort)."""
+        entry = {
+            "devices": sorted(self.mac_addresses),
+            "timestamp": timestamp,
+            "result": result,
+        }
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.shared_cache_file.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, self.shared_cache_file)
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
+
     def _is_cache_valid(self):
         """Check if cached result is still valid."""
         if self._cached_result is None or self._cache_timestamp is None:
             return False
 
-        elapsed = (datetime.now() - self._cache_timestamp).total_seconds()
+        elapsed = time.monotonic() - self._cache_timestamp
         return elapsed < self.cache_duration
 
     def _detect_presence(self):
         """
         Attempt to detect presence using available methods.
 
+        Runs all methods concurrently so a quick dhcp-leases check overlaps a
+        slow arp-scan (up to its 5 second timeout), but answers are taken in
+        order of preference: a later method is only trusted if every earlier
+        one failed.
+
         Returns:
             bool: True if any device detected, False otherwise
         """
-        # Try arp-scan first (fast, accurate, requires sudo)
-        try:
-            result = self._check_arp_scan()
-            if result is not None:
-                return result
-        except Exception:
-            pass  # Fall through to next method
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2)
+
+        # In order of preference: arp-scan (accurate, requires sudo), then
+        # dhcp-leases (no sudo required, but leases outlive departures)
+        methods = [self._check_arp_scan, self._check_dhcp_leases]
+        futures = [self._executor.submit(method) for method in methods]
+
+        for future in futures:
+            try:
+                result = future.result()
+            except Exception:
+                continue  # Treat as method failure
 
-        # Try dhcp-leases as fallback (no sudo required)
-        try:
-            result = self._check_dhcp_leases()
             if result is not None:
                 return result
-        except Exception:
-            pass
 
         # All methods failed - assume not present
         return False
 
+    def _contains_device(self, text):
+        """Check if lowercased text contains any configured MAC address."""
+        return self._mac_pattern is not None and self._mac_pattern.search(text) is not None
+
+    def _check_arp_probe(self):
+        """
+        Check presence with an in-process ARP sweep using scapy (optional).
+
+        Avoids the fork/exec and sudo overhead of arp-scan and stops as soon as
+        a configured device replies. Needs CAP_NET_RAW instead of sudo:
+            sudo setcap cap_net_raw=eip "$(readlink -f "$(which python3)")"
+
+        Returns:
+            bool or None: True if detected, False if not detected, None if unavailable
+        """
+        global _scapy_missing
+        if _scapy_missing:
+            return None
+
+        try:
+            from scapy.all import ARP, Ether, conf, srp
+        except ImportError:
+            _scapy_missing = True  # scapy not installed; don't retry every check
+            return None
+
+        # Directly connected IPv4 networks on the default interface
+        networks = []
+        for net, mask, gateway, iface, _, _ in conf.route.routes:
+            if iface != conf.iface or gateway != "0.0.0.0":
+                continue
+            prefix = bin(mask).count("1")
+            if not ARP_PROBE_MIN_PREFIX <= prefix < 32:
+                continue
+            network = ipaddress.IPv4Network((net, prefix))
+            if network.is_private and not network.is_loopback:
+                networks.append(str(network))
+
+        if not networks:
+            return None
+
+        def is_known_device(packet):
+            return ARP in packet and self._contains_device(packet[ARP].hwsrc.lower())
+
+        try:
+            answered, _ = srp(
+                [Ether(dst="ff:ff:ff:ff:ff:ff") / ARP(pdst=network) for network in networks],
+                timeout=2,
+                stop_filter=is_known_device,
+                verbose=False
+            )
+        except OSError:
+            return None  # Missing CAP_NET_RAW
+
+        return any(is_known_device(reply) for _, reply in answered)
+
     def _check_arp_scan(self):
         """
         Check presence using arp-scan (requires sudo).
 
+        Uses the in-process scapy probe when available, falling back to the
+        arp-scan command otherwise.
+
         Returns:
             bool or None: True if detected, False if not detected, None if method failed
         """
+        result = self._check_arp_probe()
+        if result is not None:
+            return result
+
         try:
             # Run arp-scan on local network
             result = subprocess.run(
-                ["sudo", "arp-scan", "--localnet", "--quiet"],
+                ARP_SCAN_COMMAND,
                 capture_output=True,
                 text=True,
-                timeout=5
+                timeout=ARP_SCAN_TIMEOUT
             )
 
             if result.returncode != 0:
                 return None  # Command failed
 
             # Check if any MAC address is in the output
-            output_lower = result.stdout.lower()
-            for mac in self.mac_addresses:
-                if mac in output_lower:
-                    return True
-
-            return False
+            return self._contains_device(result.stdout.lower())
 
         except (subprocess.TimeoutExpired, FileNotFoundError, PermissionError):
             return None
@@ -138,26 +300,30 @@ class PresenceDetector:
         ]
 
         try:
-            # Find the first existing lease file
-            lease_file = None
-            for path in lease_paths:
-                if Path(path).exists():
-                    lease_file = Path(path)
-                    break
-
+            # Find the first existing lease file (only once - it doesn't move)
+            if self._lease_file is None:
+                for path in lease_paths:
+                    if Path(path).exists():
+                        self._lease_file = Path(path)
+                        break
+
+            lease_file = self._lease_file
             if not lease_file:
                 return None  # No lease file found
 
-            # Read lease file
-            content = lease_file.read_text().lower()
-
-            # Check if any MAC address is in the lease file
-            for mac in self.mac_addresses:
-                if mac in content:
-                    return True
+            # Stream the lease file (can be large on long-lived servers) and
+            # stop at the first line mentioning a configured device
+            with lease_file.open('r', errors='replace') as f:
+                for line in f:
+                    if self._contains_device(line.lower()):
+                        return True
 
             return False
 
+        except FileNotFoundError:
+            self._lease_file = None  # Removed since resolved, search again next time
+            return None
+
         except (IOError, PermissionError):
             return None
 
@@ -181,14 +347,14 @@ def main():
     print("First check:")
     result = detector.is_anyone_home()
     print(f"  Result: {result}")
-    print(f"  Cache timestamp: {detector._cache_timestamp}")
+    print(f"  Cache age: {time.monotonic() - detector._cache_timestamp:.1f} seconds")
     print()
 
     # Immediate second check (should use cache)
     print("Immediate second check (should use cache):")
     result = detector.is_anyone_home()
     print(f"  Result: {result}")
-    print(f"  Cache timestamp: {detector._cache_timestamp}")
+    print(f"  Cache age: {time.monotonic() - detector._cache_timestamp:.1f} seconds")
     print()
 
 
@@ -1,35 +1,60 @@
 #!/usr/bin/env python3
 """
-Subway Dashboard - 1-Bit Dithered Fix
+Subway Dashboard - Native 1-Bit Rendering
 """
 
+import hashlib
 import io
 import os
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache, wraps
 from pathlib import Path
 
 import yaml
 import requests
-import yfinance as yf
+from requests.adapters import HTTPAdapter
 from flask import Flask, send_file, request, jsonify
 from PIL import Image, ImageDraw, ImageFont
-from nyct_gtfs import NYCTFeed
 
+# Prefer the libyaml-backed loader, which is several times faster
 try:
-    from get_train_times import ROUTE_TO_FEED
+    from yaml import CSafeLoader as _YamlLoader
 except ImportError:
-    ROUTE_TO_FEED = {}
-
-try:
-    from presence_detector import PresenceDetector
-except ImportError:
-    PresenceDetector = None
+    from yaml import SafeLoader as _YamlLoader
 
 app = Flask(__name__)
+# The firmware parses /refresh-rate itself, so skip key sorting and
+# pretty-printing when serializing JSON
+app.json.sort_keys = False
+app.json.compact = True
 
 # ============ CONFIG ============
 # Global presence detector (initialized on first use)
 _presence_detector = None
+# Last parsed config as (mtime_ns, config), reused until the file changes
+_config_cache = None
+# Indexed MTA feeds as url -> (time.monotonic() fetched, arrivals by stop).
+# MTA regenerates feeds roughly every 30 seconds, so a short TTL is safe.
+FEED_CACHE_TTL = 15  # seconds
+_feed_cache = {}
+_feed_lock = threading.Lock()
+# Last /display.bmp response, reused for repeat requests (retries, 304s).
+# Kept well below the refresh interval so a manual wake (button press) gets
+# a fresh frame rather than one rendered a whole interval ago.
+BMP_CACHE_TTL = 20  # seconds
+_bmp_cache = {"expires": 0.0, "battery": None, "bmp": b"", "etag": ""}
+_bmp_lock = threading.Lock()
+# Shared HTTP session so repeat calls to open-meteo and Yahoo reuse their
+# keep-alive TCP+TLS connections instead of handshaking every time
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+# Forecasts and quotes change slowly compared to the display refresh rate
+WEATHER_CACHE_TTL = 600  # seconds
+FINANCE_CACHE_TTL = 60  # seconds
 DISPLAY_WIDTH = 800
 DISPLAY_HEIGHT = 480
 
@@ -40,11 +65,30 @@ LOCAL_FONT_ICON = SCRIPT_DIR / "DejaVuSans.ttf"
 SYSTEM_ICON_PATHS = ["/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "arial.ttf"]
 
 # COLORS
+# Frames are drawn directly on a 1-bit canvas (the e-ink panel is 1-bit), so
+# secondary "gray" text is drawn black rather than dithered
 COLOR_WHITE = 255
 COLOR_BLACK = 0
-COLOR_GRAY = 80
-
-
+COLOR_GRAY = COLOR_BLACK
+
+# Fixed 62-byte header for a bottom-up 1-bit DISPLAY_WIDTH x DISPLAY_HEIGHT
+# BMP (file header, BITMAPINFOHEADER, black/white palette). Rows are padded
+# to 4 bytes; 800 pixels is exactly 100 bytes so no padding is needed.
+BMP_ROW_STRIDE = ((DISPLAY_WIDTH + 31) // 32) * 4
+BMP_HEADER = (
+    struct.pack("<2sIHHI", b"BM", 62 + BMP_ROW_STRIDE * DISPLAY_HEIGHT, 0, 0, 62)
+    + struct.pack(
+        "<IiiHHIIiiII",
+        40, DISPLAY_WIDTH, DISPLAY_HEIGHT, 1, 1, 0,
+        BMP_ROW_STRIDE * DISPLAY_HEIGHT, 3780, 3780, 2, 2,
+    )
+    + bytes([0, 0, 0, 0, 255, 255, 255, 0])
+)
+
+
+# FreeType faces are reusable across draws, so each (size, is_bold, is_icon)
+# font is only loaded from disk once per process
+@lru_cache(maxsize=None)
 def get_font(size, is_bold=False, is_icon=False):
     font_path = None
     if is_icon:
@@ -71,9 +115,17 @@ def get_font(size, is_bold=False, is_icon=False):
 
 
 def load_config():
+    global _config_cache
+    config_path = SCRIPT_DIR / "config.yaml"
     try:
-        with open(SCRIPT_DIR / "config.yaml", "r") as f:
-            return yaml.safe_load(f)
+        mtime = os.stat(config_path).st_mtime_ns
+        if _config_cache is not None and _config_cache[0] == mtime:
+            return _config_cache[1]
+
+        with open(config_path, "r") as f:
+            config = yaml.load(f, Loader=_YamlLoader)
+        _config_cache = (mtime, config)
+        return config
     except:
         return {}
 
@@ -81,7 +133,11 @@ def load_config():
 def get_presence_detector():
     """Get or initialize the global presence detector."""
     global _presence_detector
-    if _presence_detector is None and PresenceDetector is not None:
+    if _presence_detector is None:
+        try:
+            from presence_detector import PresenceDetector
+        except ImportError:
+            return None
         config = load_config()
         refresh_config = config.get("refresh_rate", {})
         devices = refresh_config.get("devices", [])
@@ -140,6 +196,35 @@ def calculate_refresh_rate():
 
 
 # ============ DATA ============
+def ttl_cache(ttl):
+    """Cache a function's results per positional args for ttl seconds.
+
+    Empty results (None, []) mean the fetch failed and are not cached, so
+    the next request retries.
+    """
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args):
+            with lock:
+                cached = cache.get(args)
+            if cached is not None and time.monotonic() - cached[0] < ttl:
+                return cached[1]
+
+            result = func(*args)
+            if result:
+                with lock:
+                    cache[args] = (time.monotonic(), result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+@ttl_cache(WEATHER_CACHE_TTL)
 def get_weather(lat, lon):
     try:
         url = "https://api.open-meteo.com/v1/forecast"
@@ -152,71 +237,82 @@ def get_weather(lat, lon):
             "timezone": "auto",
             "forecast_days": 8,
         }
-        r = requests.get(url, params=params, timeout=5)
+        r = _session.get(url, params=params, timeout=5)
         r.raise_for_status()
         return r.json()
     except:
         return None
 
 
+@ttl_cache(FINANCE_CACHE_TTL)
 def get_finance():
     data = []
     try:
         tickers = {"^GSPC": "S&P", "BTC-USD": "BTC", "GC=F": "Gold"}
-        t_obj = yf.Tickers(" ".join(tickers.keys()))
+        # One spark request returns every symbol's recent closes plus the
+        # previous close, avoiding yfinance's per-ticker requests and pandas
+        r = _session.get(
+            "https://query1.finance.yahoo.com/v8/finance/spark",
+            params={"symbols": ",".join(tickers), "range": "1d", "interval": "5m"},
+            headers={"User-Agent": "Mozilla/5.0"},
+            timeout=5,
+        )
+        r.raise_for_status()
+        quotes = r.json()
         for sym, label in tickers.items():
-            info = t_obj.tickers[sym].fast_info
-            if info.last_price:
-                pct = (
-                    (info.last_price - info.previous_close) / info.previous_close
-                ) * 100
-                data.append({"label": label, "price": info.last_price, "change": pct})
+            quote = quotes.get(sym) or {}
+            closes = [c for c in quote.get("close") or [] if c is not None]
+            prev = quote.get("chartPreviousClose") or quote.get("previousClose")
+            if closes and prev:
+                price = closes[-1]
+                pct = ((price - prev) / prev) * 100
+                data.append({"label": label, "price": price, "change": pct})
     except:
         pass
     return data
 
 
+def get_feed_arrivals(url):
+    """Arrivals index for one MTA feed (see get_train_times.index_feed)."""
+    from get_train_times import cached_feed, index_feed
+
+    # Held while fetching so concurrent requests wait for one download
+    # instead of each fetching the same feed
+    with _feed_lock:
+        cached = _feed_cache.get(url)
+        if cached is not None and time.monotonic() - cached[0] < FEED_CACHE_TTL:
+            return cached[1]
+        trips_by_stop = index_feed(cached_feed(url))
+        _feed_cache[url] = (time.monotonic(), trips_by_stop)
+        return trips_by_stop
+
+
 def get_subway(config):
     if not config:
         return None
-    routes = config.get("routes", [])
-    stop_ids = config.get("stop_ids", [config.get("stop_id")])
-    if not isinstance(stop_ids, list):
-        stop_ids = [stop_ids]
+    # Imported on first use: get_train_times pulls in protobuf, which
+    # /refresh-rate never needs
+    try:
+        from get_train_times import FEEDS, station_stop_ids
+    except ImportError:
+        return None
+    routes = frozenset(config.get("routes", []))
+    stop_ids = station_stop_ids(config)
     res = {"uptown": [], "downtown": []}
-    feeds = {}
-    for r in routes:
-        u = ROUTE_TO_FEED.get(r)
-        if u:
-            feeds.setdefault(u, []).append(r)
+    # One reference time so both directions agree on minutes away
+    now_ts = time.time()
     try:
-        for url, r_list in feeds.items():
-            feed = NYCTFeed(url)
+        for feed_routes, url in FEEDS:
+            if not feed_routes & routes:
+                continue
+            trips_by_stop = get_feed_arrivals(url)
             for sid in stop_ids:
-                for t in feed.filter_trips(headed_for_stop_id=f"{sid}N", underway=True):
-                    if t.route_id in r_list:
-                        for u in t.stop_time_updates:
-                            if u.stop_id == f"{sid}N" and u.arrival:
-                                m = int(
-                                    (u.arrival - datetime.now()).total_seconds() / 60
-                                )
-                                if m >= 0:
-                                    res["uptown"].append(
-                                        {"route": t.route_id, "min": m}
-                                    )
-                                break
-                for t in feed.filter_trips(headed_for_stop_id=f"{sid}S", underway=True):
-                    if t.route_id in r_list:
-                        for u in t.stop_time_updates:
-                            if u.stop_id == f"{sid}S" and u.arrival:
-                                m = int(
-                                    (u.arrival - datetime.now()).total_seconds() / 60
-                                )
-                                if m >= 0:
-                                    res["downtown"].append(
-                                        {"route": t.route_id, "min": m}
-                                    )
-                                break
+                for suffix, arrivals in (("N", res["uptown"]), ("S", res["downtown"])):
+                    for route, arrival_ts in trips_by_stop.get(f"{sid}{suffix}", ()):
+                        if route in routes:
+                            m = int((arrival_ts - now_ts) / 60)
+                            if m >= 0:
+                                arrivals.append({"route": route, "min": m})
     except:
         pass
     res["uptown"].sort(key=lambda x: x["min"])
@@ -241,8 +337,16 @@ def get_w_icon(code):
     return "?"
 
 
+# Labels repeat from frame to frame (tickers, weekdays, "Now", arrows), and
+# fonts are cached by get_font(), so measure each (text, font) pair only once.
+# Measured in mode "1" to match the unantialiased glyphs drawn on the canvas.
+@lru_cache(maxsize=512)
+def measure_text(text, font):
+    return font.getbbox(text, "1")
+
+
 def draw_centered_text(draw, x, y, text, font, fill=COLOR_BLACK, align="left"):
-    bbox = draw.textbbox((0, 0), text, font=font)
+    bbox = measure_text(text, font)
     w = bbox[2] - bbox[0]
     if align == "center":
         draw.text((x - (w // 2), y), text, font=font, fill=fill)
@@ -253,12 +357,46 @@ def draw_centered_text(draw, x, y, text, font, fill=COLOR_BLACK, align="left"):
     return w
 
 
-def draw_train_block(draw, x, y, train, font_bul, font_time, is_first=False):
-    size = 56
-    draw.ellipse([x, y, x + size, y + size], fill=COLOR_BLACK)
+@lru_cache(maxsize=None)
+def get_icon_mask(icon, font):
+    """Pre-rasterized 1-bit mask of a weather icon glyph."""
+    bbox = measure_text(icon, font)
+    mask = Image.new("1", (max(1, bbox[2]), max(1, bbox[3])), color=0)
+    ImageDraw.Draw(mask).text((0, 0), icon, font=font, fill=255)
+    return mask
+
+
+def draw_icon(draw, x, y, icon, font, align="left"):
+    """Like draw_centered_text(), but stamps a cached glyph bitmap."""
+    bbox = measure_text(icon, font)
+    w = bbox[2] - bbox[0]
+    if align == "center":
+        x -= w // 2
+    elif align == "right":
+        x -= w
+    draw.bitmap((int(x), y), get_icon_mask(icon, font), fill=COLOR_BLACK)
+    return w
 
-    bw = draw.textbbox((0, 0), train["route"], font=font_bul)[2]
-    draw.text((x + (size - bw) / 2, y), train["route"], fill=COLOR_WHITE, font=font_bul)
+
+@lru_cache(maxsize=None)
+def get_bullet_sprite(route, size, font_bul):
+    """Pre-rendered route bullet (black disc, white letter) and its disc mask."""
+    sprite = Image.new("1", (size + 1, size + 1), color=COLOR_WHITE)
+    draw = ImageDraw.Draw(sprite)
+    draw.ellipse([0, 0, size, size], fill=COLOR_BLACK)
+
+    bw = draw.textbbox((0, 0), route, font=font_bul)[2]
+    draw.text(((size - bw) / 2, 0), route, fill=COLOR_WHITE, font=font_bul)
+
+    mask = Image.new("1", sprite.size, color=0)
+    ImageDraw.Draw(mask).ellipse([0, 0, size, size], fill=255)
+    return sprite, mask
+
+
+def draw_train_block(img, draw, x, y, train, font_bul, font_time, is_first=False):
+    size = 56
+    sprite, mask = get_bullet_sprite(train["route"], size, font_bul)
+    img.paste(sprite, (x, y), mask)
 
     text_color = COLOR_BLACK if is_first else COLOR_GRAY
     text_y = y + 60
@@ -286,18 +424,28 @@ def draw_train_block(draw, x, y, train, font_bul, font_time, is_first=False):
         )
 
 
-def generate_image(battery_percent=None):
-    img = Image.new("L", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color=COLOR_WHITE)
+@lru_cache(maxsize=4)
+def get_template(lbl_up, lbl_down):
+    """Static frame (divider lines and direction labels) shared by every render."""
+    img = Image.new("1", (DISPLAY_WIDTH, DISPLAY_HEIGHT), color=COLOR_WHITE)
     draw = ImageDraw.Draw(img)
+    f_header = get_font(24, True)
+
+    draw.line([(0, 115), (DISPLAY_WIDTH, 115)], fill=COLOR_BLACK, width=4)
+    draw.line([(600, 115), (600, 360)], fill=COLOR_BLACK, width=3)
+    draw.text((20, 122), lbl_up, font=f_header, fill=COLOR_GRAY)
+    draw.text((20, 245), lbl_down, font=f_header, fill=COLOR_GRAY)
+    draw.line([(0, 360), (DISPLAY_WIDTH, 360)], fill=COLOR_BLACK, width=3)
+    return img
+
 
+def generate_image(battery_percent=None):
+    """Render the dashboard; returns (image, refresh_seconds shown on it)."""
     # FONTS
     f_huge = get_font(68, True)
     f_large = get_font(48, True)
     f_med = get_font(28, True)
 
-    # New Smaller Header Font (24px instead of 28px)
-    f_header = get_font(24, True)
-
     f_small = get_font(20, True)
     f_tiny = get_font(16)
 
@@ -305,61 +453,67 @@ def generate_image(battery_percent=None):
     f_icon_med = get_font(28, is_icon=True)
     f_icon_sm = get_font(20, is_icon=True)
 
+    # Fetch all external data concurrently; each call mostly waits on the
+    # network, so the render waits for the slowest instead of the sum
+    config = load_config()
+    station = (config.get("stations") or config.get("stops", [{}]))[0]
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        f_weather = ex.submit(
+            get_weather, station.get("lat", 40.78), station.get("lon", -73.97)
+        )
+        f_subway = ex.submit(get_subway, station)
+        f_fin = ex.submit(get_finance)
+        f_refresh = ex.submit(calculate_refresh_rate)
+    weather = f_weather.result()
+    subway = f_subway.result()
+    fin = f_fin.result()
+    refresh_seconds = f_refresh.result()
+
+    # Start from the cached static frame; only dynamic content is drawn below
+    dirs = station.get("directions", {})
+    lbl_up = dirs.get("uptown", "UP").split("(")[0].strip()
+    lbl_down = dirs.get("downtown", "DOWN").split("(")[0].strip()
+    img = get_template(lbl_up, lbl_down).copy()
+    draw = ImageDraw.Draw(img)
+
     # --- 1. HEADER (0 - 115) ---
     now = datetime.now()
     w_time = draw_centered_text(draw, 20, 10, now.strftime("%I:%M").lstrip("0"), f_huge)
     draw.text((20 + w_time + 8, 58), now.strftime("%p"), font=f_med, fill=COLOR_GRAY)
     draw.text((22, 80), now.strftime("%A, %b %d"), font=f_med)
 
-    config = load_config()
-    station = (config.get("stations") or config.get("stops", [{}]))[0]
-    weather = get_weather(station.get("lat", 40.78), station.get("lon", -73.97))
-
     if weather and "current" in weather:
         temp = f"{int(weather['current']['temperature_2m'])}°"
         icon = get_w_icon(weather["current"]["weather_code"])
         w_t = draw_centered_text(
             draw, DISPLAY_WIDTH - 20, 20, temp, f_huge, align="right"
         )
-        draw_centered_text(
+        draw_icon(
             draw, DISPLAY_WIDTH - 20 - w_t - 10, 15, icon, f_icon_lg, align="right"
         )
 
-    draw.line([(0, 115), (DISPLAY_WIDTH, 115)], fill=COLOR_BLACK, width=4)
-
     # --- 2. MAIN BODY (115 - 360) ---
-    draw.line([(600, 115), (600, 360)], fill=COLOR_BLACK, width=3)
-
-    subway = get_subway(station)
-    dirs = station.get("directions", {})
     slot_centers = [75, 225, 375, 525]
 
     # === UPTOWN ===
-    lbl_up = dirs.get("uptown", "UP").split("(")[0].strip()
-    draw.text((20, 122), lbl_up, font=f_header, fill=COLOR_GRAY)
-
     if subway and subway["uptown"]:
         for i, t in enumerate(subway["uptown"][:4]):
             center_x = slot_centers[i]
             # y=148 slightly nudged down
             draw_train_block(
-                draw, center_x - 28, 148, t, f_large, f_med, is_first=(i == 0)
+                img, draw, center_x - 28, 148, t, f_large, f_med, is_first=(i == 0)
             )
 
     # === DOWNTOWN ===
-    lbl_down = dirs.get("downtown", "DOWN").split("(")[0].strip()
-    draw.text((20, 245), lbl_down, font=f_header, fill=COLOR_GRAY)
-
     if subway and subway["downtown"]:
         for i, t in enumerate(subway["downtown"][:4]):
             center_x = slot_centers[i]
             # y=270 ensures the bottom is clear
             draw_train_block(
-                draw, center_x - 28, 270, t, f_large, f_med, is_first=(i == 0)
+                img, draw, center_x - 28, 270, t, f_large, f_med, is_first=(i == 0)
             )
 
     # === FINANCE COLUMN ===
-    fin = get_finance()
     fin_center_x = 700
     fin_y = 125
 
@@ -372,8 +526,8 @@ def generate_image(battery_percent=None):
         )
 
         pct_str = f"{abs(f['change']):.1f}%"
-        aw = draw.textbbox((0, 0), sym, font=f_icon_med)[2]
-        pw = draw.textbbox((0, 0), pct_str, font=f_med)[2]
+        aw = measure_text(sym, f_icon_med)[2]
+        pw = measure_text(pct_str, f_med)[2]
         total_w = aw + 4 + pw
         start_x = fin_center_x - (total_w // 2)
 
@@ -395,7 +549,6 @@ def generate_image(battery_percent=None):
 
     # --- 3. FOOTER (360 - 480) ---
     fy = 360
-    draw.line([(0, fy), (DISPLAY_WIDTH, fy)], fill=COLOR_BLACK, width=3)
 
     if weather and "daily" in weather:
         d = weather["daily"]
@@ -409,7 +562,7 @@ def generate_image(battery_percent=None):
             cx = (i * col_w) + (col_w / 2)
 
             draw_centered_text(draw, cx, fy + 10, day_label, f_small, align="center")
-            draw_centered_text(draw, cx, fy + 35, icon, f_icon_med, align="center")
+            draw_icon(draw, cx, fy + 35, icon, f_icon_med, align="center")
             draw_centered_text(draw, cx - 12, fy + 75, f"{hi}°", f_med, align="center")
             draw.text((cx + 12, fy + 82), f"{lo}°", font=f_tiny, fill=COLOR_GRAY)
 
@@ -455,19 +608,27 @@ def generate_image(battery_percent=None):
         draw.text((batt_x + battery_width + terminal_width + 6, batt_y + 2), batt_text, font=f_tiny, fill=COLOR_BLACK)
 
     # --- NEXT REFRESH TIME (top center, above battery) ---
-    refresh_seconds = calculate_refresh_rate()
     next_refresh_time = datetime.now() + timedelta(seconds=refresh_seconds)
     next_refresh_str = next_refresh_time.strftime("Next update: %I:%M %p")
 
     # Calculate text position for center alignment
-    bbox = draw.textbbox((0, 0), next_refresh_str, font=f_tiny)
+    bbox = measure_text(next_refresh_str, f_tiny)
     text_width = bbox[2] - bbox[0]
     refresh_x = (DISPLAY_WIDTH - text_width) // 2
     refresh_y = 30  # Top, below battery indicator
 
     draw.text((refresh_x, refresh_y), next_refresh_str, font=f_tiny, fill=COLOR_BLACK)
 
-    return img
+    return img, refresh_seconds
+
+
+def encode_bmp(img):
+    """Encode a 1-bit display-sized image as BMP bytes.
+
+    Prepends the precomputed header to Pillow's packed rows, written
+    bottom-up as BMP expects, instead of going through the BMP plugin.
+    """
+    return BMP_HEADER + img.tobytes("raw", ("1", BMP_ROW_STRIDE, -1))
 
 
 @app.route("/refresh-rate")
@@ -497,25 +658,37 @@ def serve_bmp():
         if not (0 <= battery_param <= 100):
             battery_param = None  # Invalid value, ignore it
 
-    img = generate_image(battery_percent=battery_param)
-
-    # === CRITICAL FIX ===
-    # Convert to 1-bit B&W using dithering.
-    # This solves the 385KB size issue and makes it ~48KB
-    img = img.convert("1")
-    # ====================
-
-    b = io.BytesIO()
-    img.save(b, "BMP")
-    b.seek(0)
-    return send_file(b, mimetype="image/bmp")
+    with _bmp_lock:
+        if not (
+            time.monotonic() < _bmp_cache["expires"]
+            and _bmp_cache["battery"] == battery_param
+        ):
+            # Already 1-bit, so no conversion is needed (~48KB BMP instead of 385KB)
+            img, refresh_seconds = generate_image(battery_percent=battery_param)
+            bmp = encode_bmp(img)
+            _bmp_cache["bmp"] = bmp
+            _bmp_cache["etag"] = hashlib.blake2b(bmp, digest_size=8).hexdigest()
+            _bmp_cache["battery"] = battery_param
+            _bmp_cache["expires"] = time.monotonic() + min(refresh_seconds, BMP_CACHE_TTL)
+
+        bmp = _bmp_cache["bmp"]
+        etag = _bmp_cache["etag"]
+        max_age = max(0, int(_bmp_cache["expires"] - time.monotonic()))
+
+    # conditional=True answers a matching If-None-Match with an empty 304
+    return send_file(
+        io.BytesIO(bmp),
+        mimetype="image/bmp",
+        etag=etag,
+        max_age=max_age,
+        conditional=True,
+    )
 
 
 @app.route("/display.png")
 def serve_png():
-    img = generate_image()
-    # Optional: convert PNG to 1-bit too if you want to preview the exact look
-    # img = img.convert("1")
+    # Same 1-bit frame the display receives
+    img, _ = generate_image()
     b = io.BytesIO()
     img.save(b, "PNG")
     b.seek(0)
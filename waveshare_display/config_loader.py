@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Config Loader - Shared YAML loading for the Pi stats display
+
+PiStatsDisplay and SystemMonitor read the same config file on startup.
+Parsed files are cached by path and invalidated when the file's mtime or
+size changes, so each file is parsed once per process.
+
+Across restarts, a JSON copy of each parsed file is kept in
+~/.cache/pi-zero/ and read instead of the YAML while the file's mtime and
+size still match; JSON parses much faster than YAML. The copy lives outside
+the repo because the config holds device MAC addresses.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+
+import yaml
+
+# Prefer the libyaml-backed loader, which is several times faster
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Maximum number of parsed files kept (least recently used are evicted)
+YAML_CACHE_SIZE = 100
+
+# Path -> (st_mtime, st_size, parsed data)
+_YAML_CACHE = OrderedDict()
+
+# Parsed-config JSON copies, named by a hash of the YAML file's absolute path
+SIDECAR_DIR = Path.home() / ".cache" / "pi-zero"
+
+
+def _sidecar_path(path):
+    """JSON cache file for a YAML file."""
+    key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+    return SIDECAR_DIR / f"config-{key}.json"
+
+
+def _load_with_sidecar(path, st):
+    """Parse path, preferring an up-to-date JSON sidecar and refreshing a stale one."""
+    sidecar = _sidecar_path(path)
+    try:
+        with open(sidecar, 'r') as f:
+            cached = json.load(f)
+        # Exact match: a restored or checked-out file can be older than the sidecar
+        if cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+            return cached["data"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # Missing, unreadable or corrupt sidecar: parse the YAML
+
+    with open(path, 'r') as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+
+    _write_sidecar(sidecar, st, data)
+    return data
+
+
+def _write_sidecar(sidecar, st, data):
+    """Atomically write data as JSON (best effort, skipped if not representable)."""
+    try:
+        text = json.dumps(data)
+    except (TypeError, ValueError):
+        return  # e.g. YAML dates or sets
+
+    # Non-string keys would come back as strings; keep the YAML authoritative
+    if json.loads(text) != data:
+        return
+
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=sidecar.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": data}, f)
+            os.replace(tmp_path, sidecar)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass  # Cache directory not writable
+
+
+def load_yaml_cached(path):
+    """
+    Load a YAML file, reusing the parsed result while the file is unchanged.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Parsed YAML data (a private copy the caller may modify)
+
+    Raises:
+        OSError: If the file can't be read
+        yaml.YAMLError: If the file isn't valid YAML
+    """
+    key = str(path)
+    st = os.stat(key)
+
+    entry = _YAML_CACHE.get(key)
+    if entry is not None and entry[:2] == (st.st_mtime, st.st_size):
+        _YAML_CACHE.move_to_end(key)
+        return copy.deepcopy(entry[2])
+
+    data = _load_with_sidecar(key, st)
+
+    _YAML_CACHE[key] = (st.st_mtime, st.st_size, data)
+    _YAML_CACHE.move_to_end(key)
+    if len(_YAML_CACHE) > YAML_CACHE_SIZE:
+        _YAML_CACHE.popitem(last=False)
+
+    return copy.deepcopy(data)
@@ -8,22 +8,39 @@ Uses the waveshare_epd library installed on the Pi.
 
 import sys
 import os
+import hashlib
+import importlib
 from pathlib import Path
 
+from PIL import Image, ImageDraw
+
 # Add Waveshare driver directory to Python path
 EPAPER_LIB = Path.home() / "e-Paper" / "RaspberryPi_JetsonNano" / "python" / "lib"
 sys.path.insert(0, str(EPAPER_LIB))
 
-try:
-    from waveshare_epd import epdconfig
-except ImportError as e:
-    print(f"Error importing waveshare_epd: {e}")
-    print(f"Tried to load from: {EPAPER_LIB}")
-    print(f"Path exists: {EPAPER_LIB.exists()}")
-    print(f"sys.path: {sys.path[:3]}")
-    print("\nPlease install the Waveshare e-Paper library:")
-    print("  cd ~ && git clone https://github.com/waveshare/e-Paper.git")
-    sys.exit(1)
+SUPPORTED_VERSIONS = ("V2", "V3", "V4")
+
+# The drivers open SPI at 4 MHz; the panel controllers accept writes well above 10 MHz
+DEFAULT_SPI_SPEED_HZ = 10_000_000
+
+
+def _import_waveshare(name):
+    """
+    Import a waveshare_epd submodule on first use.
+
+    The drivers pull in spidev and the GPIO libraries, so they are only loaded
+    once the hardware is actually initialized.
+    """
+    try:
+        return importlib.import_module(f"waveshare_epd.{name}")
+    except ImportError as e:
+        print(f"Error importing waveshare_epd: {e}")
+        print(f"Tried to load from: {EPAPER_LIB}")
+        print(f"Path exists: {EPAPER_LIB.exists()}")
+        print(f"sys.path: {sys.path[:3]}")
+        print("\nPlease install the Waveshare e-Paper library:")
+        print("  cd ~ && git clone https://github.com/waveshare/e-Paper.git")
+        sys.exit(1)
 
 
 class EPaperDisplay:
@@ -37,103 +54,198 @@ class EPaperDisplay:
     WIDTH = 122   # Physical width (rotated 90°)
     HEIGHT = 250  # Physical height (rotated 90°)
 
-    def __init__(self, version="V3"):
+    def __init__(self, version="V3", spi_speed_hz=DEFAULT_SPI_SPEED_HZ):
         """
         Initialize the e-Paper display.
 
         Args:
             version: Hardware version - "V2", "V3", or "V4"
+            spi_speed_hz: SPI clock to use after init (None keeps the driver's default)
         """
         self.version = version.upper()
+        self.spi_speed_hz = spi_speed_hz
         self.epd = None
         self.initialized = False
         self.partial_refresh_count = 0
         self.max_partial_refreshes = 10  # Full refresh after this many partial
-
-        # Import the appropriate driver
-        if self.version == "V2":
-            from waveshare_epd import epd2in13_V2
-            self.epd_module = epd2in13_V2
-        elif self.version == "V3":
-            from waveshare_epd import epd2in13_V3
-            self.epd_module = epd2in13_V3
-        elif self.version == "V4":
-            from waveshare_epd import epd2in13_V4
-            self.epd_module = epd2in13_V4
-        else:
+        self.max_erased_pixels = 3000    # Full refresh after this many black pixels change
+        self.erased_pixel_count = 0
+        self._last_buffer_hash = None    # Hash of the frame currently on the panel
+        self._last_black_pixels = None
+        self._fast_getbuffer = False     # Set once validated against the driver
+        self._asleep = False             # Panel needs init() again before drawing
+
+        # The matching driver is imported by init()
+        if self.version not in SUPPORTED_VERSIONS:
             raise ValueError(f"Unknown display version: {version}. Use V2, V3, or V4")
+        self.epd_module = None
 
     def init(self):
-        """Initialize the display hardware."""
+        """Initialize the display hardware, or wake it after sleep()."""
         if not self.initialized:
+            self.epd_module = _import_waveshare(f"epd2in13_{self.version}")
             self.epd = self.epd_module.EPD()
-            self.epd.init()
+            self._init_panel()
             self.initialized = True
+            self._fast_getbuffer = self._validate_fast_getbuffer()
+        elif self._asleep:
+            self._init_panel()
+
+    def _init_panel(self):
+        """Run the driver's init, which reopens SPI at its default clock."""
+        self.epd.init()
+        self._set_spi_speed()
+        self._asleep = False
+
+    def _set_spi_speed(self):
+        """Raise the SPI clock set up by epdconfig (frame transfers dominate refresh time)."""
+        if not self.spi_speed_hz:
+            return
+
+        spi = getattr(_import_waveshare("epdconfig"), "SPI", None)
+        if spi is None:
+            return  # Not a spidev-based platform
+
+        try:
+            spi.max_speed_hz = self.spi_speed_hz
+        except (OSError, ValueError) as e:
+            print(f"Could not set SPI speed to {self.spi_speed_hz} Hz: {e}")
 
     def clear(self):
         """Clear the display to white."""
-        if not self.initialized:
+        if not self.initialized or self._asleep:
             self.init()
         self.epd.Clear(0xFF)
+        self._last_buffer_hash = None
+        self._last_black_pixels = None
 
     def display(self, image):
         """
         Display an image on the e-Paper screen.
 
         Args:
-            image: PIL Image object (mode '1' for B&W)
+            image: PIL Image object (must be mode '1')
         """
-        if not self.initialized:
+        if not self.initialized or self._asleep:
             self.init()
 
-        # Convert to 1-bit if not already
-        if image.mode != '1':
-            image = image.convert('1')
+        # Callers render in 1-bit; packing assumes it
+        assert image.mode == '1', f"expected a mode '1' image, got {image.mode!r}"
 
         # Full display update
-        self.epd.display(self.epd.getbuffer(image))
+        self._display_buf(self._getbuffer(image))
+
+    def _display_buf(self, buf):
+        """Full refresh from an already packed frame buffer."""
+        self.epd.display(buf)
         self.partial_refresh_count = 0
+        self.erased_pixel_count = 0
+        self._remember_buffer(buf)
 
     def display_partial(self, image):
         """
         Display using partial refresh (faster, less flicker).
 
         Only available on V2/V3. Falls back to full refresh on V4.
-        Automatically does full refresh every N partial updates to prevent ghosting.
+        Automatically does full refresh every N partial updates (or once enough
+        pixels have changed) to prevent ghosting. Frames identical to the one
+        already on the panel are skipped.
 
         Args:
-            image: PIL Image object (mode '1' for B&W)
+            image: PIL Image object (must be mode '1')
         """
         if not self.initialized:
             self.init()
 
-        # Convert to 1-bit if not already
-        if image.mode != '1':
-            image = image.convert('1')
+        # Callers render in 1-bit; packing assumes it
+        assert image.mode == '1', f"expected a mode '1' image, got {image.mode!r}"
+
+        # Skip the SPI transfer and panel refresh (and waking it) if nothing changed
+        buf = self._getbuffer(image)
+        buf_hash = hashlib.blake2b(buf, digest_size=8).digest()
+        if buf_hash == self._last_buffer_hash:
+            return
+
+        if self._asleep:
+            self.init()
+
+        # Approximate how much was redrawn by the change in black pixels
+        black_pixels = self._count_black_pixels(buf)
+        if self._last_black_pixels is not None:
+            self.erased_pixel_count += abs(black_pixels - self._last_black_pixels)
 
         # Check if we need a full refresh
         if self.partial_refresh_count >= self.max_partial_refreshes:
             print(f"Performing full refresh (after {self.partial_refresh_count} partial refreshes)")
-            self.display(image)
+            self._display_buf(buf)
+            return
+        if self.erased_pixel_count >= self.max_erased_pixels:
+            print(f"Performing full refresh (after {self.erased_pixel_count} changed pixels)")
+            self._display_buf(buf)
             return
 
         # V4 doesn't support partial refresh reliably, fallback to full
         if self.version == "V4":
-            self.display(image)
+            self._display_buf(buf)
             return
 
         # V2/V3 partial refresh
         if self.partial_refresh_count == 0:
             # First partial refresh needs base image
-            self.epd.displayPartBaseImage(self.epd.getbuffer(image))
+            self.epd.displayPartBaseImage(buf)
 
-        self.epd.displayPartial(self.epd.getbuffer(image))
+        self.epd.displayPartial(buf)
         self.partial_refresh_count += 1
+        self._last_buffer_hash = buf_hash
+        self._last_black_pixels = black_pixels
+
+    def _getbuffer(self, image):
+        """Pack a mode '1' image into the panel's frame buffer format."""
+        if self._fast_getbuffer and image.size == (self.epd.height, self.epd.width):
+            return self._getbuffer_fast(image)
+        return self.epd.getbuffer(image)
+
+    def _getbuffer_fast(self, image):
+        """
+        Pack a landscape image with PIL instead of the driver's per-pixel loop.
+
+        The driver stores the frame as portrait rows, with image column x as
+        row (height - 1 - x) and each row padded to whole bytes with white.
+        """
+        line_width = (self.epd.width + 7) // 8 * 8
+        frame = Image.new('1', (line_width, self.epd.height), 255)
+        frame.paste(image.transpose(Image.Transpose.ROTATE_90), (0, 0))
+        return bytearray(frame.tobytes())
+
+    def _validate_fast_getbuffer(self):
+        """Check the fast packer against the driver's getbuffer on a test frame."""
+        image = Image.new('1', (self.epd.height, self.epd.width), 255)
+        draw = ImageDraw.Draw(image)
+        draw.line([(0, 0), (image.width - 1, image.height - 1)], fill=0, width=3)
+        draw.rectangle([(5, 3), (40, 20)], fill=0)
+        draw.point([(image.width - 1, 0), (0, image.height - 1)], fill=0)
+
+        try:
+            return bytes(self._getbuffer_fast(image)) == bytes(self.epd.getbuffer(image))
+        except Exception:
+            return False
+
+    def _count_black_pixels(self, buf):
+        """Count black (0) bits in a packed 1-bit frame buffer."""
+        return len(buf) * 8 - bin(int.from_bytes(buf, 'big')).count('1')
+
+    def _remember_buffer(self, buf):
+        """Record the frame buffer now shown on the panel."""
+        self._last_buffer_hash = hashlib.blake2b(buf, digest_size=8).digest()
+        self._last_black_pixels = self._count_black_pixels(buf)
 
     def sleep(self):
         """Put the display into low-power sleep mode."""
         if self.initialized:
             self.epd.sleep()
+            self._asleep = True
+            # Waking loses the partial refresh base image
+            self.partial_refresh_count = 0
 
     def cleanup(self):
         """
@@ -143,7 +255,7 @@ class EPaperDisplay:
         """
         if self.initialized:
             self.epd.sleep()
-            epdconfig.module_exit()
+            _import_waveshare("epdconfig").module_exit()
             self.initialized = False
 
     def __enter__(self):
@@ -7,17 +7,22 @@ Refreshes every 30-60 seconds.
 """
 
 import sys
-import time
 import signal
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import yaml
 
-from epaper_driver import EPaperDisplay
+from config_loader import load_yaml_cached
+from epaper_driver import DEFAULT_SPI_SPEED_HZ, EPaperDisplay
 from renderer import SystemRenderer
 from system_monitor import SystemMonitor
 
+# Sleeps stop at each minute boundary to redraw the clock, so no refresh
+# interval can be longer than this
+MAX_REFRESH_INTERVAL = 60
+
 
 class PiStatsDisplay:
     """Main controller for the Pi stats e-Paper display."""
@@ -32,14 +37,19 @@ class PiStatsDisplay:
         self.config = self._load_config(config_path)
         self.display_version = self.config.get("display", {}).get("version", "V3")
         self.refresh_interval = self.config.get("display", {}).get("refresh_interval", 30)
+        self.max_refresh_interval = self.config.get("display", {}).get("max_refresh_interval", MAX_REFRESH_INTERVAL)
+        self.spi_speed_hz = self.config.get("display", {}).get("spi_speed_hz", DEFAULT_SPI_SPEED_HZ)
 
-        self.epd = EPaperDisplay(version=self.display_version)
+        self.epd = EPaperDisplay(version=self.display_version, spi_speed_hz=self.spi_speed_hz)
         self.renderer = SystemRenderer()
-        self.monitor = SystemMonitor()
+        self.monitor = SystemMonitor(cache_ttls=self.config.get("display", {}).get("stats_cache"))
 
         self.running = True
+        self._stop_event = threading.Event()
         self.last_update = None
         self.update_count = 0
+        self._last_frame_key = None  # What is currently on the panel
+        self.skip_rate = 0.0         # EMA of ticks where only the clock changed
 
     def _load_config(self, config_path):
         """Load configuration from YAML file."""
@@ -57,14 +67,18 @@ class PiStatsDisplay:
                 return {}
 
         try:
-            with open(config_file, 'r') as f:
-                return yaml.safe_load(f) or {}
+            return load_yaml_cached(config_file) or {}
         except yaml.YAMLError as e:
             print(f"Error parsing config: {e}")
             return {}
 
     def update_display(self):
-        """Update the display with current system stats."""
+        """
+        Update the display with current system stats.
+
+        Returns:
+            bool: True if anything besides the clock changed
+        """
         try:
             print(f"Fetching system stats...")
             stats = self.monitor.get_all_stats()
@@ -78,6 +92,14 @@ class PiStatsDisplay:
             if stats.get("is_home") is not None:
                 print(f"  Presence: {'HOME' if stats['is_home'] else 'AWAY'}")
 
+            # Skip rendering and the panel refresh if nothing visible changed
+            frame_key = self.renderer.frame_key(stats)
+            stats_changed = self._last_frame_key is None or frame_key[1:] != self._last_frame_key[1:]
+            if frame_key == self._last_frame_key:
+                self.last_update = datetime.now()
+                print("No visible change, skipping refresh")
+                return False
+
             # Render image
             image = self.renderer.render_system_stats(stats)
 
@@ -90,21 +112,71 @@ class PiStatsDisplay:
                 self.epd.display_partial(image)
 
             self.update_count += 1
+            self._last_frame_key = frame_key
             self.last_update = datetime.now()
             print(f"Display updated at {self.last_update.strftime('%I:%M:%S %p')}")
+            return stats_changed
 
         except Exception as e:
             print(f"Error updating display: {e}")
             import traceback
             traceback.print_exc()
 
-            # Show error on display
+            # Show error on display (and redraw stats next time)
+            self._last_frame_key = None
             try:
                 error_image = self.renderer.render_error(str(e)[:50])
                 self.epd.display(error_image)
             except:
                 pass
 
+        return True
+
+    def _adapt_interval(self, interval, changed):
+        """
+        Widen the refresh interval while the stats keep coming back unchanged.
+
+        Tracks an EMA of ticks where nothing but the clock changed, over
+        roughly the last 20 ticks. Above 80%, the interval doubles (up to
+        max_refresh_interval, clamped to MAX_REFRESH_INTERVAL because sleeps
+        never run past the next minute boundary); any stats change snaps it
+        back to refresh_interval.
+
+        Returns:
+            int: Interval to use for the next tick
+        """
+        self.skip_rate += (2 / 21) * ((0.0 if changed else 1.0) - self.skip_rate)
+
+        if changed:
+            new_interval = self.refresh_interval
+        elif self.skip_rate > 0.8:
+            max_interval = min(self.max_refresh_interval, MAX_REFRESH_INTERVAL)
+            new_interval = min(interval * 2, max(max_interval, self.refresh_interval))
+        else:
+            new_interval = interval
+
+        if new_interval != interval:
+            print(f"Refresh interval: {new_interval} seconds (skip rate {self.skip_rate:.0%})")
+        return new_interval
+
+    def _seconds_until_next_update(self, interval, now=None):
+        """
+        Seconds to sleep before the next refresh.
+
+        Normally interval seconds after the last update, but never past the
+        next minute boundary so the clock is redrawn as soon as it changes.
+        """
+        now = now or datetime.now()
+        to_next_minute = 60 - now.second - now.microsecond / 1_000_000
+
+        if self.last_update:
+            next_update_time = self.last_update + timedelta(seconds=interval)
+            sleep_s = max(0, (next_update_time - now).total_seconds())
+        else:
+            sleep_s = interval
+
+        return min(sleep_s, to_next_minute)
+
     def run(self):
         """Main run loop with continuous refresh."""
         print("Starting Pi Stats Display...")
@@ -119,18 +191,17 @@ class PiStatsDisplay:
         self.update_display()
 
         # Main loop
+        interval = self.refresh_interval
         try:
             while self.running:
-                # Check if it's time for scheduled refresh
-                if self.last_update:
-                    next_update_time = self.last_update + timedelta(seconds=self.refresh_interval)
-
-                    if datetime.now() >= next_update_time:
-                        print("\n--- Scheduled refresh ---")
-                        self.update_display()
+                # Sleep until the next scheduled refresh (stop() wakes us early)
+                sleep_s = self._seconds_until_next_update(interval)
+                if self._stop_event.wait(sleep_s):
+                    break
 
-                # Sleep briefly to avoid busy loop
-                time.sleep(1)
+                print("\n--- Scheduled refresh ---")
+                changed = self.update_display()
+                interval = self._adapt_interval(interval, changed)
 
         except KeyboardInterrupt:
             print("\nShutting down...")
@@ -146,6 +217,7 @@ class PiStatsDisplay:
     def stop(self):
         """Stop the main loop."""
         self.running = False
+        self._stop_event.set()
 
 
 def signal_handler(signum, frame):
@@ -196,7 +268,7 @@ def main():
 
     if args.version:
         display.display_version = args.version
-        display.epd = EPaperDisplay(version=args.version)
+        display.epd = EPaperDisplay(version=args.version, spi_speed_hz=display.spi_speed_hz)
 
     if args.interval:
         display.refresh_interval = args.interval
@@ -7,10 +7,32 @@ Shows: CPU temp, time, RAM usage, WiFi status, home/away status.
 """
 
 from datetime import datetime
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 from pathlib import Path
 
 
+@lru_cache(maxsize=64)
+def _measure(text, font):
+    """Return (width, height) of text as drawn on a 1-bit image (cached per font)."""
+    bbox = font.getbbox(text, "1")
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+
+@lru_cache(maxsize=256)
+def _text_mask(text, font):
+    """
+    Pre-rasterized 1-bit mask of a string and its offset from the draw position.
+
+    Stamping the mask gives the same pixels as draw.text() without re-running
+    the font rasterizer for strings that repeat between frames.
+    """
+    left, top, right, bottom = font.getbbox(text, "1")
+    mask = Image.new('1', (max(1, right - left), max(1, bottom - top)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+    return mask, (left, top)
+
+
 class SystemRenderer:
     """
     Renders system stats for 250×122 e-Paper display.
@@ -24,9 +46,29 @@ class SystemRenderer:
     WIDTH = 250
     HEIGHT = 122
 
+    # Layout positions shared by the static template and dynamic content
+    HEADER_DIVIDER_Y = 37
+    FOOTER_Y = 100
+    MIDDLE_Y = 42
+    COL1_X = 4
+    COL2_X = 85
+    COL3_X = 170
+    RAM_BAR_WIDTH = 55
+    RAM_BAR_HEIGHT = 6
+
     def __init__(self):
         """Initialize the renderer with fonts."""
         self.fonts = self._load_fonts()
+        self._template = self._build_template()
+
+        # Rasterize strings that appear on every frame up front
+        for text, font_name in [("AM", "small"), ("PM", "small"), ("HOME", "medium"), ("AWAY", "medium"),
+                                ("Pi Stats", "small"), ("N/A", "medium"), ("No WiFi", "small")]:
+            _text_mask(text, self.fonts[font_name])
+
+        # Frames are drawn into one persistent image instead of a new one per refresh
+        self._image = Image.new('1', (self.WIDTH, self.HEIGHT), 255)
+        self._draw = ImageDraw.Draw(self._image)
 
     def _load_fonts(self):
         """Load fonts with fallbacks."""
@@ -51,6 +93,78 @@ class SystemRenderer:
 
         return fonts
 
+    def _build_template(self):
+        """Draw the parts of the stats screen that never change (labels, dividers, bar outline)."""
+        image = Image.new('1', (self.WIDTH, self.HEIGHT), 255)
+        draw = ImageDraw.Draw(image)
+
+        # Divider lines
+        draw.line([(0, self.HEADER_DIVIDER_Y), (self.WIDTH, self.HEADER_DIVIDER_Y)], fill=0, width=1)
+        draw.line([(0, self.FOOTER_Y), (self.WIDTH, self.FOOTER_Y)], fill=0, width=1)
+
+        # Column labels
+        draw.text((self.COL1_X, self.MIDDLE_Y), "CPU", font=self.fonts["tiny"], fill=0)
+        draw.text((self.COL2_X, self.MIDDLE_Y), "RAM", font=self.fonts["tiny"], fill=0)
+        draw.text((self.COL3_X, self.MIDDLE_Y), "WiFi", font=self.fonts["tiny"], fill=0)
+
+        # RAM bar outline
+        bar_y = self.MIDDLE_Y + 30
+        draw.rectangle([(self.COL2_X, bar_y), (self.COL2_X + self.RAM_BAR_WIDTH, bar_y + self.RAM_BAR_HEIGHT)], outline=0, width=1)
+
+        return image
+
+    def _draw_text(self, draw, xy, text, font_name):
+        """Draw black text by stamping its cached mask."""
+        mask, (left, top) = _text_mask(text, self.fonts[font_name])
+        draw.bitmap((xy[0] + left, xy[1] + top), mask, fill=0)
+
+    def _ram_fill_width(self, ram_percent):
+        """Width in pixels of the filled part of the RAM bar."""
+        return int((self.RAM_BAR_WIDTH - 2) * (ram_percent / 100))
+
+    def _signal_bars(self, signal):
+        """Convert a WiFi signal level in dBm to 1-4 bars (None if unknown)."""
+        if signal is None:
+            return None
+        if signal >= -50:
+            return 4
+        elif signal >= -60:
+            return 3
+        elif signal >= -70:
+            return 2
+        return 1
+
+    def frame_key(self, stats, now=None):
+        """
+        Summarize what render_system_stats would draw for these stats.
+
+        Two calls return equal keys only if the rendered frames would be
+        identical, so callers can skip rendering and refreshing the panel.
+        The first element is the clock; the rest cover the stats.
+
+        Args:
+            stats: dict from SystemMonitor.get_all_stats()
+            now: Time to render (default: now)
+
+        Returns:
+            tuple: Hashable frame key
+        """
+        now = now or datetime.now()
+        cpu_temp = stats.get("cpu_temp")
+        ram_percent = stats.get("ram", {}).get("percent", 0)
+        wifi = stats.get("wifi", {})
+
+        return (
+            now.strftime("%Y-%m-%d %H:%M"),
+            None if cpu_temp is None else f"{cpu_temp:.0f}",
+            f"{ram_percent:.0f}",
+            self._ram_fill_width(ram_percent),
+            wifi.get("connected", False),
+            wifi.get("ssid"),
+            self._signal_bars(wifi.get("signal")),
+            stats.get("is_home"),
+        )
+
     def render_system_stats(self, stats):
         """
         Render system statistics.
@@ -65,11 +179,13 @@ class SystemRenderer:
                 }
 
         Returns:
-            PIL Image object (250×122, mode '1')
+            PIL Image object (250×122, mode '1'). The image is reused by the
+            next call, so copy it if it needs to outlive the next render.
         """
-        # Create blank white image
-        image = Image.new('1', (self.WIDTH, self.HEIGHT), 255)
-        draw = ImageDraw.Draw(image)
+        # Reset the frame to the static labels and dividers
+        image = self._image
+        draw = self._draw
+        image.paste(self._template, (0, 0))
 
         # === HEADER: Time + Date ===
         now = datetime.now()
@@ -78,51 +194,41 @@ class SystemRenderer:
         date_str = now.strftime("%a %b %d")
 
         # Draw time (left side)
-        draw.text((4, 2), time_str, font=self.fonts["huge"], fill=0)
+        self._draw_text(draw, (4, 2), time_str, "huge")
 
         # Draw AM/PM smaller next to time
-        time_bbox = draw.textbbox((4, 2), time_str, font=self.fonts["huge"])
-        time_width = time_bbox[2] - time_bbox[0]
-        draw.text((time_width + 8, 8), am_pm, font=self.fonts["small"], fill=0)
+        time_width, _ = _measure(time_str, self.fonts["huge"])
+        self._draw_text(draw, (time_width + 8, 8), am_pm, "small")
 
         # Draw date (right side)
-        date_bbox = draw.textbbox((0, 0), date_str, font=self.fonts["small"])
-        date_width = date_bbox[2] - date_bbox[0]
-        draw.text((self.WIDTH - date_width - 4, 4), date_str, font=self.fonts["small"], fill=0)
-
-        # Divider line
-        draw.line([(0, 37), (self.WIDTH, 37)], fill=0, width=1)
+        date_width, _ = _measure(date_str, self.fonts["small"])
+        self._draw_text(draw, (self.WIDTH - date_width - 4, 4), date_str, "small")
 
         # === MIDDLE: System Stats (3 columns) ===
-        middle_y = 42
-        col1_x = 4
-        col2_x = 85
-        col3_x = 170
+        middle_y = self.MIDDLE_Y
+        col1_x = self.COL1_X
+        col2_x = self.COL2_X
+        col3_x = self.COL3_X
 
         # Column 1: CPU Temperature
         cpu_temp = stats.get("cpu_temp")
         if cpu_temp is not None:
             temp_str = f"{cpu_temp:.0f}°C"
-            draw.text((col1_x, middle_y), "CPU", font=self.fonts["tiny"], fill=0)
-            draw.text((col1_x, middle_y + 10), temp_str, font=self.fonts["large"], fill=0)
+            self._draw_text(draw, (col1_x, middle_y + 10), temp_str, "large")
         else:
-            draw.text((col1_x, middle_y), "CPU", font=self.fonts["tiny"], fill=0)
-            draw.text((col1_x, middle_y + 10), "N/A", font=self.fonts["medium"], fill=0)
+            self._draw_text(draw, (col1_x, middle_y + 10), "N/A", "medium")
 
         # Column 2: RAM Usage
         ram = stats.get("ram", {})
         ram_percent = ram.get("percent", 0)
         ram_str = f"{ram_percent:.0f}%"
-        draw.text((col2_x, middle_y), "RAM", font=self.fonts["tiny"], fill=0)
-        draw.text((col2_x, middle_y + 10), ram_str, font=self.fonts["large"], fill=0)
+        self._draw_text(draw, (col2_x, middle_y + 10), ram_str, "large")
 
-        # Draw RAM bar graph (mini)
+        # Fill the RAM bar graph (outline is in the template)
         bar_x = col2_x
         bar_y = middle_y + 30
-        bar_width = 55
-        bar_height = 6
-        draw.rectangle([(bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height)], outline=0, width=1)
-        fill_width = int((bar_width - 2) * (ram_percent / 100))
+        bar_height = self.RAM_BAR_HEIGHT
+        fill_width = self._ram_fill_width(ram_percent)
         if fill_width > 0:
             draw.rectangle([(bar_x + 1, bar_y + 1), (bar_x + 1 + fill_width, bar_y + bar_height - 1)], fill=0)
 
@@ -131,25 +237,15 @@ class SystemRenderer:
         wifi_connected = wifi.get("connected", False)
         wifi_ssid = wifi.get("ssid", "")
 
-        draw.text((col3_x, middle_y), "WiFi", font=self.fonts["tiny"], fill=0)
-
         if wifi_connected:
             # Truncate SSID to fit (max 10 chars)
             ssid_display = wifi_ssid[:10] if len(wifi_ssid) > 10 else wifi_ssid
-            draw.text((col3_x, middle_y + 10), ssid_display, font=self.fonts["small"], fill=0)
+            self._draw_text(draw, (col3_x, middle_y + 10), ssid_display, "small")
 
             # WiFi signal indicator (simple bars)
             signal = wifi.get("signal")
             if signal is not None:
-                # Convert dBm to bars
-                if signal >= -50:
-                    bars = 4
-                elif signal >= -60:
-                    bars = 3
-                elif signal >= -70:
-                    bars = 2
-                else:
-                    bars = 1
+                bars = self._signal_bars(signal)
 
                 # Draw signal bars (smaller)
                 bar_x = col3_x
@@ -167,13 +263,10 @@ class SystemRenderer:
                             (bar_x + i * 5 + 3, bar_y_base)
                         ], outline=0, width=1)
         else:
-            draw.text((col3_x, middle_y + 10), "No WiFi", font=self.fonts["small"], fill=0)
-
-        # Divider line
-        footer_y = 100
-        draw.line([(0, footer_y), (self.WIDTH, footer_y)], fill=0, width=1)
+            self._draw_text(draw, (col3_x, middle_y + 10), "No WiFi", "small")
 
         # === FOOTER: Presence Status ===
+        footer_y = self.FOOTER_Y
         is_home = stats.get("is_home")
 
         if is_home is not None:
@@ -182,15 +275,13 @@ class SystemRenderer:
             status_text = "HOME" if is_home else "AWAY"
 
             # Center the status text
-            status_bbox = draw.textbbox((0, 0), status_text, font=self.fonts["medium"])
-            status_width = status_bbox[2] - status_bbox[0]
-            draw.text(((self.WIDTH - status_width) // 2, footer_y + 5), status_text, font=self.fonts["medium"], fill=0)
+            status_width, _ = _measure(status_text, self.fonts["medium"])
+            self._draw_text(draw, ((self.WIDTH - status_width) // 2, footer_y + 5), status_text, "medium")
         else:
             # No presence detection configured
             status_text = "Pi Stats"
-            status_bbox = draw.textbbox((0, 0), status_text, font=self.fonts["small"])
-            status_width = status_bbox[2] - status_bbox[0]
-            draw.text(((self.WIDTH - status_width) // 2, footer_y + 6), status_text, font=self.fonts["small"], fill=0)
+            status_width, _ = _measure(status_text, self.fonts["small"])
+            self._draw_text(draw, ((self.WIDTH - status_width) // 2, footer_y + 6), status_text, "small")
 
         return image
 
@@ -217,26 +308,34 @@ class SystemRenderer:
         # Draw "ERROR" text
         draw.text((50, 20), "ERROR", font=self.fonts["large"], fill=0)
 
-        # Draw error message (wrapped)
-        words = error_message.split()
+        # Wrap error message to the text area width (up to 3 lines)
+        font = self.fonts["small"]
+        max_width = self.WIDTH - 20
+        space_width = font.getlength(" ")
         lines = []
         current_line = ""
-
-        for word in words:
-            test_line = current_line + " " + word if current_line else word
-            if len(test_line) <= 30:
-                current_line = test_line
+        current_width = 0
+
+        for word in error_message.split():
+            word_width = font.getlength(word)
+            if not current_line:
+                current_line, current_width = word, word_width
+            elif current_width + space_width + word_width <= max_width:
+                current_line += " " + word
+                current_width += space_width + word_width
             else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
+                lines.append(current_line)
+                current_line, current_width = word, word_width
+                if len(lines) == 3:
+                    current_line = ""
+                    break
 
         if current_line:
             lines.append(current_line)
 
         # Draw up to 3 lines
         y = 50
-        for line in lines[:3]:
+        for line in lines:
             draw.text((10, y), line, font=self.fonts["small"], fill=0)
             y += 15
 
@@ -5,41 +5,116 @@ System Monitor - Collect Raspberry Pi system information
 Gathers CPU temp, RAM usage, WiFi status, and presence detection status.
 """
 
+import array
+import fcntl
 import os
 import psutil
+import socket
+import struct
 import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 from pathlib import Path
 
+from config_loader import load_yaml_cached
+
+SUBWAY_DIR = Path(__file__).parent.parent / "subway_train_times"
+
+THERMAL_ZONE_PATH = "/sys/class/thermal/thermal_zone0/temp"
+MEMINFO_PATH = "/proc/meminfo"
+
+# Wireless extensions: read the SSID with an ioctl and the signal level from
+# /proc instead of spawning iwgetid/iwconfig
+WIFI_INTERFACE = "wlan0"
+PROC_NET_WIRELESS = "/proc/net/wireless"
+SIOCGIWESSID = 0x8B1B
+IW_ESSID_MAX_SIZE = 32
+IWREQ_FORMAT = "16sPHH"  # ifr_name, essid pointer, length, flags
+IWREQ_SIZE = 32          # sizeof(struct iwreq)
+
+
+@lru_cache(maxsize=None)
+def _get_presence_detector_cls():
+    """Import PresenceDetector from subway_train_times (path setup and import run once)."""
+    if str(SUBWAY_DIR) not in sys.path:
+        sys.path.insert(0, str(SUBWAY_DIR))
+    from presence_detector import PresenceDetector
+    return PresenceDetector
+
+
+def ttl_cache(key, seconds):
+    """
+    Cache a SystemMonitor getter's result on the instance.
+
+    Args:
+        key: Name of the stat, used to override the TTL via cache_ttls
+        seconds: Default time to reuse the result
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self):
+            ttl = self.cache_ttls.get(key, seconds)
+            now = time.monotonic()
+            cached = self._stat_cache.get(key)
+            if cached is not None and now - cached[0] < ttl:
+                return cached[1]
+            value = func(self)
+            self._stat_cache[key] = (now, value)
+            return value
+        return wrapper
+    return decorator
+
 
 class SystemMonitor:
     """Collects system information from Raspberry Pi."""
 
-    def __init__(self):
-        """Initialize system monitor."""
+    def __init__(self, cache_ttls=None):
+        """
+        Initialize system monitor.
+
+        Args:
+            cache_ttls: Seconds to reuse slow-changing stats, e.g.
+                {"wifi": 300, "presence": 60} (defaults shown)
+        """
+        self.cache_ttls = cache_ttls or {}
+        self._stat_cache = {}
+
+        # Keep the thermal zone and meminfo open; the kernel regenerates them on each read
+        try:
+            self._thermal_fd = os.open(THERMAL_ZONE_PATH, os.O_RDONLY)
+        except OSError:
+            self._thermal_fd = None
+        try:
+            self._meminfo_fd = os.open(MEMINFO_PATH, os.O_RDONLY)
+        except OSError:
+            self._meminfo_fd = None
+
+        self._wifi_sock = None
+
         self.presence_detector = None
         self._init_presence_detector()
 
+        # Stats are mostly subprocess/IO waits, so collect them concurrently
+        self._executor = ThreadPoolExecutor(max_workers=4)
+
     def _init_presence_detector(self):
         """Initialize presence detector if available."""
         try:
-            import sys
-            sys.path.insert(0, str(Path(__file__).parent.parent / "subway_train_times"))
-            from presence_detector import PresenceDetector
-            import yaml
-
             # Try to load config
             config_path = Path(__file__).parent / "config.yaml"
             if not config_path.exists():
-                config_path = Path(__file__).parent.parent / "subway_train_times" / "config.yaml"
+                config_path = SUBWAY_DIR / "config.yaml"
 
             if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config = yaml.safe_load(f)
+                config = load_yaml_cached(config_path)
 
                 refresh_config = config.get("refresh_rate", {})
                 devices = refresh_config.get("devices", [])
 
                 if devices:
+                    PresenceDetector = _get_presence_detector_cls()
                     self.presence_detector = PresenceDetector(mac_addresses=devices)
                     print(f"Presence detector initialized with {len(devices)} device(s)")
         except Exception as e:
@@ -53,8 +128,16 @@ class SystemMonitor:
         Returns:
             float: Temperature in °C, or None if unavailable
         """
+        if self._thermal_fd is not None:
+            try:
+                # Method 1: /sys/class/thermal (generic Linux, no subprocess)
+                temp_millidegrees = int(os.pread(self._thermal_fd, 16, 0).strip())
+                return temp_millidegrees / 1000.0
+            except:
+                pass
+
         try:
-            # Method 1: vcgencmd (Raspberry Pi specific)
+            # Method 2: vcgencmd (Raspberry Pi specific)
             result = subprocess.run(
                 ["vcgencmd", "measure_temp"],
                 capture_output=True,
@@ -68,14 +151,6 @@ class SystemMonitor:
         except:
             pass
 
-        try:
-            # Method 2: /sys/class/thermal (generic Linux)
-            with open("/sys/class/thermal/thermal_zone0/temp", "r") as f:
-                temp_millidegrees = int(f.read().strip())
-                return temp_millidegrees / 1000.0
-        except:
-            pass
-
         return None
 
     def get_ram_usage(self):
@@ -85,6 +160,27 @@ class SystemMonitor:
         Returns:
             dict: {"percent": 45.2, "used_mb": 512, "total_mb": 1024}
         """
+        if self._meminfo_fd is not None:
+            try:
+                # MemTotal and MemAvailable are within the first few lines
+                meminfo = {}
+                for line in os.pread(self._meminfo_fd, 512, 0).decode().splitlines():
+                    name, _, value = line.partition(":")
+                    if name in ("MemTotal", "MemAvailable"):
+                        meminfo[name] = int(value.split()[0])  # kB
+                        if len(meminfo) == 2:
+                            break
+
+                total = meminfo["MemTotal"]
+                used = total - meminfo["MemAvailable"]
+                return {
+                    "percent": used / total * 100,
+                    "used_mb": used // 1024,
+                    "total_mb": total // 1024
+                }
+            except:
+                pass
+
         try:
             mem = psutil.virtual_memory()
             return {
@@ -95,6 +191,29 @@ class SystemMonitor:
         except:
             return {"percent": 0, "used_mb": 0, "total_mb": 0}
 
+    def _read_ssid(self):
+        """Read the associated SSID via SIOCGIWESSID ("" if not associated)."""
+        if self._wifi_sock is None:
+            self._wifi_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        essid = array.array("B", bytes(IW_ESSID_MAX_SIZE + 1))
+        addr, size = essid.buffer_info()
+        request = struct.pack(IWREQ_FORMAT, WIFI_INTERFACE.encode(), addr, size, 0)
+        result = fcntl.ioctl(self._wifi_sock, SIOCGIWESSID, request.ljust(IWREQ_SIZE, b"\0"))
+        length = struct.unpack(IWREQ_FORMAT, result[:struct.calcsize(IWREQ_FORMAT)])[2]
+        return essid.tobytes()[:length].rstrip(b"\0").decode(errors="replace")
+
+    def _read_signal(self):
+        """Read the signal level in dBm from /proc/net/wireless."""
+        with open(PROC_NET_WIRELESS, "r") as f:
+            # Two header lines, then e.g. "wlan0: 0000   70.  -45.  -256 ..."
+            for line in f.readlines()[2:]:
+                fields = line.split()
+                if fields and fields[0] == WIFI_INTERFACE + ":":
+                    return int(float(fields[3]))
+        return None
+
+    @ttl_cache("wifi", seconds=300)
     def get_wifi_status(self):
         """
         Get WiFi connection status.
@@ -103,7 +222,26 @@ class SystemMonitor:
             dict: {"connected": True, "ssid": "MyNetwork", "signal": -45}
         """
         try:
-            # Check if wlan0 is up
+            # Fast path: wireless extensions, no subprocesses
+            ssid = self._read_ssid()
+            if not ssid:
+                return {"connected": False, "ssid": None, "signal": None}
+
+            try:
+                signal_dbm = self._read_signal()
+            except:
+                signal_dbm = None
+
+            return {
+                "connected": True,
+                "ssid": ssid,
+                "signal": signal_dbm
+            }
+        except:
+            pass
+
+        try:
+            # Fallback: iwgetid/iwconfig
             result = subprocess.run(
                 ["iwgetid", "-r"],
                 capture_output=True,
@@ -142,6 +280,7 @@ class SystemMonitor:
 
         return {"connected": False, "ssid": None, "signal": None}
 
+    @ttl_cache("presence", seconds=60)
     def is_anyone_home(self):
         """
         Check if anyone is home using presence detection.
@@ -164,11 +303,16 @@ class SystemMonitor:
         Returns:
             dict: All system information
         """
+        cpu_temp = self._executor.submit(self.get_cpu_temp)
+        ram = self._executor.submit(self.get_ram_usage)
+        wifi = self._executor.submit(self.get_wifi_status)
+        is_home = self._executor.submit(self.is_anyone_home)
+
         return {
-            "cpu_temp": self.get_cpu_temp(),
-            "ram": self.get_ram_usage(),
-            "wifi": self.get_wifi_status(),
-            "is_home": self.is_anyone_home()
+            "cpu_temp": cpu_temp.result(),
+            "ram": ram.result(),
+            "wifi": wifi.result(),
+            "is_home": is_home.result()
         }
 
 
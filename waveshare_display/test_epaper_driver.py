@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Tests for EPaperDisplay using a stand-in for the Waveshare driver."""
+
+import sys
+import types
+import unittest
+
+from PIL import Image, ImageDraw
+
+from epaper_driver import EPaperDisplay
+
+
+class FakeEPD:
+    """Records calls; getbuffer follows the Waveshare 2.13" landscape packing."""
+
+    width = 122
+    height = 250
+
+    def __init__(self):
+        self.calls = []
+        self.getbuffer_calls = 0
+
+    def init(self):
+        # Like the real drivers, module_init() reopens SPI at 4 MHz
+        sys.modules["waveshare_epd.epdconfig"].SPI.max_speed_hz = 4_000_000
+        self.calls.append("init")
+
+    def Clear(self, color):
+        self.calls.append("Clear")
+
+    def sleep(self):
+        self.calls.append("sleep")
+
+    def display(self, buf):
+        self.calls.append("display")
+
+    def displayPartBaseImage(self, buf):
+        self.calls.append("base")
+
+    def displayPartial(self, buf):
+        self.calls.append("partial")
+
+    def getbuffer(self, image):
+        self.getbuffer_calls += 1
+        linewidth = (self.width + 7) // 8
+        buf = [0xFF] * (linewidth * self.height)
+        pixels = image.convert('1').load()
+        for y in range(image.height):
+            for x in range(image.width):
+                if pixels[x, y] == 0:
+                    newx = y
+                    newy = self.height - x - 1
+                    buf[newx // 8 + newy * linewidth] &= ~(0x80 >> (y % 8))
+        return bytearray(buf)
+
+
+def install_fake_driver():
+    """Register fake waveshare_epd modules so init() imports them."""
+    package = types.ModuleType("waveshare_epd")
+    package.__path__ = []
+    epdconfig = types.ModuleType("waveshare_epd.epdconfig")
+    epdconfig.module_exit = lambda: None
+    epdconfig.SPI = types.SimpleNamespace(max_speed_hz=4_000_000)
+    driver = types.ModuleType("waveshare_epd.epd2in13_V3")
+    driver.EPD = FakeEPD
+    sys.modules.update({
+        "waveshare_epd": package,
+        "waveshare_epd.epdconfig": epdconfig,
+        "waveshare_epd.epd2in13_V3": driver,
+    })
+
+
+def make_frame(text):
+    image = Image.new('1', (EPaperDisplay.HEIGHT, EPaperDisplay.WIDTH), 255)
+    ImageDraw.Draw(image).text((10, 10), text, fill=0)
+    return image
+
+
+class EPaperDisplayTest(unittest.TestCase):
+    def setUp(self):
+        install_fake_driver()
+        self.display = EPaperDisplay(version="V3")
+        self.display.init()
+
+    def test_fast_getbuffer_matches_driver(self):
+        image = make_frame("12:34")
+        self.assertTrue(self.display._fast_getbuffer)
+        self.assertEqual(bytes(self.display._getbuffer_fast(image)), bytes(self.display.epd.getbuffer(image)))
+
+    def test_clear_keeps_fast_getbuffer(self):
+        epd = self.display.epd
+        self.display.display(make_frame("one"))
+        self.display.clear()
+        self.display.display(make_frame("two"))
+
+        self.assertTrue(self.display._fast_getbuffer)
+        # Only the validation at init() used the driver's packer
+        self.assertEqual(epd.getbuffer_calls, 1)
+        self.assertEqual(epd.calls, ["init", "display", "Clear", "display"])
+
+    def test_wake_after_sleep_restores_spi_speed(self):
+        epd = self.display.epd
+        spi = sys.modules["waveshare_epd.epdconfig"].SPI
+        self.assertEqual(spi.max_speed_hz, self.display.spi_speed_hz)
+
+        self.display.sleep()
+        self.display.display_partial(make_frame("awake"))
+
+        self.assertEqual(epd.calls, ["init", "sleep", "init", "base", "partial"])
+        self.assertEqual(spi.max_speed_hz, self.display.spi_speed_hz)
+
+    def test_unchanged_frame_does_not_wake_panel(self):
+        epd = self.display.epd
+        self.display.display_partial(make_frame("same"))
+        self.display.sleep()
+        self.display.display_partial(make_frame("same"))
+
+        self.assertEqual(epd.calls, ["init", "base", "partial", "sleep"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Tests for PiStatsDisplay refresh scheduling."""
+
+import types
+import unittest
+from datetime import datetime, timedelta
+
+from pi_stats_display import MAX_REFRESH_INTERVAL, PiStatsDisplay
+
+
+class RefreshScheduleTest(unittest.TestCase):
+    def setUp(self):
+        self.display = PiStatsDisplay(config_path="/nonexistent/config.yaml")
+        self.display.refresh_interval = 5
+        self.display.max_refresh_interval = 300  # Clamped to MAX_REFRESH_INTERVAL
+
+    def test_sleep_never_passes_minute_boundary(self):
+        self.display.last_update = datetime(2026, 1, 1, 12, 0, 20)
+        for second in range(20, 60):
+            now = datetime(2026, 1, 1, 12, 0, second, 500_000)
+            sleep_s = self.display._seconds_until_next_update(300, now)
+            self.assertLessEqual(now + timedelta(seconds=sleep_s), datetime(2026, 1, 1, 12, 1))
+
+    def test_minute_rollover_is_never_delayed(self):
+        # Simulate the run loop with stats that never change
+        now = datetime(2026, 1, 1, 12, 0, 0, 250_000)
+        shown_minute = now.replace(second=0, microsecond=0)
+        self.display.last_update = now
+        interval = self.display.refresh_interval
+        sleeps = []
+
+        for _ in range(200):
+            sleeps.append(self.display._seconds_until_next_update(interval, now))
+            now += timedelta(seconds=sleeps[-1])
+            minute = now.replace(second=0, microsecond=0)
+            if minute != shown_minute:
+                # The new minute is drawn exactly when it starts
+                self.assertEqual(now, minute)
+                shown_minute = minute
+            self.display.last_update = now
+            interval = self.display._adapt_interval(interval, changed=False)
+
+        # Polls start every refresh_interval and back off to once a minute
+        self.assertLessEqual(max(sleeps[:10]), self.display.refresh_interval)
+        self.assertEqual(set(sleeps[-20:]), {MAX_REFRESH_INTERVAL})
+
+    def test_clock_only_updates_grow_the_interval(self):
+        stats = {"cpu_temp": 45.0, "ram": {"percent": 30.0}, "wifi": {"connected": False}}
+        self.display.monitor = types.SimpleNamespace(get_all_stats=lambda: stats)
+        self.display.epd = types.SimpleNamespace(display=lambda image: None, display_partial=lambda image: None)
+        self.display.refresh_interval = 30
+
+        # First update draws the stats
+        self.assertTrue(self.display.update_display())
+
+        # Later frames only differ by the clock
+        interval = self.display.refresh_interval
+        for minute in range(1, 30):
+            self.display._last_frame_key = (f"12:{minute:02d}",) + self.display._last_frame_key[1:]
+            self.assertFalse(self.display.update_display())
+            interval = self.display._adapt_interval(interval, changed=False)
+
+        # Sleeps go from 30 seconds to a full minute
+        self.display.last_update = datetime(2026, 1, 1, 12, 0, 0)
+        now = self.display.last_update
+        self.assertEqual(self.display._seconds_until_next_update(30, now), 30)
+        self.assertEqual(self.display._seconds_until_next_update(interval, now), MAX_REFRESH_INTERVAL)
+
+        # A stats change snaps back to refresh_interval
+        stats["ram"] = {"percent": 80.0}
+        self.assertTrue(self.display.update_display())
+        self.assertEqual(self.display._adapt_interval(interval, changed=True), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()